@@ -46,11 +46,20 @@ Quick Start:
 For more examples and documentation, visit: https://github.com/MarsZDF/argentum
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
 from argentum.__version__ import __version__, __version_info__, get_version
 from argentum.context_decay import ContextDecay
 
 # Cost alerts and export utilities
-from argentum.cost_alerts import AlertEvent, AlertRule, CostAlerts
+from argentum.cost_alerts import (
+    AlertEvent,
+    AlertRule,
+    AlertStateStore,
+    CostAlerts,
+    RedisAlertStore,
+)
 from argentum.cost_export import CostExporter, DashboardConfig, ExportConfig
 from argentum.handoff import Handoff, HandoffProtocol
 
@@ -104,6 +113,14 @@ except ImportError as e:
     _COST_OPTIMIZATION_AVAILABLE = False
     _cost_opt_error = str(e)
 
+# Availability is fixed at import time, so the report is built once
+_DEPENDENCIES = MappingProxyType(
+    {
+        "plan_lint": _PLAN_LINT_AVAILABLE,
+        "cost_optimization": _COST_OPTIMIZATION_AVAILABLE,
+    }
+)
+
 # Public API
 __all__ = [
     # Version info
@@ -122,6 +139,8 @@ __all__ = [
     "CostAlerts",
     "AlertRule",
     "AlertEvent",
+    "AlertStateStore",
+    "RedisAlertStore",
     "CostExporter",
     "ExportConfig",
     "DashboardConfig",
@@ -140,12 +159,12 @@ __all__ = [
 ]
 
 
-def check_dependencies() -> dict:
+def check_dependencies() -> Mapping[str, bool]:
     """
     Check availability of optional dependencies.
 
     Returns:
-        Dictionary showing which optional features are available
+        Read-only mapping showing which optional features are available
 
     Examples:
         >>> deps = check_dependencies()
@@ -154,10 +173,7 @@ def check_dependencies() -> dict:
         >>> else:
         ...     print("Install argentum-agent[lint] for plan linting features")
     """
-    return {
-        "plan_lint": _PLAN_LINT_AVAILABLE,
-        "cost_optimization": _COST_OPTIMIZATION_AVAILABLE,
-    }
+    return _DEPENDENCIES
 
 
 # Convenience function for common use cases
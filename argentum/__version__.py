@@ -12,6 +12,10 @@ PATCH = 2
 BUILD = None
 PRERELEASE = None
 
+# The components above are constants, so the version strings are built once at import
+_VERSION = f"{MAJOR}.{MINOR}.{PATCH}" + (f"-{PRERELEASE}" if PRERELEASE else "")
+_BUILD_VERSION = _VERSION + (f"+{BUILD}" if BUILD else "")
+
 
 def get_version(build: bool = False) -> str:
     """
@@ -29,15 +33,7 @@ def get_version(build: bool = False) -> str:
         >>> get_version(build=True)
         '0.2.2+build.123' # if BUILD is set
     """
-    version = f"{MAJOR}.{MINOR}.{PATCH}"
-
-    if PRERELEASE:
-        version += f"-{PRERELEASE}"
-
-    if build and BUILD:
-        version += f"+{BUILD}"
-
-    return version
+    return _BUILD_VERSION if build else _VERSION
 
 
 # Compatibility with common version checking patterns
@@ -0,0 +1,31 @@
+"""
+Numba kernels for the vectorized ContextDecay paths.
+
+Importing this module raises ImportError when Numba is not installed; callers fall
+back to plain NumPy. Each kernel does its work in one pass over the columns without
+the temporary arrays the equivalent NumPy expressions allocate.
+"""
+
+from numba import njit
+
+
+@njit(cache=True)
+def decay_weights(importance, added_at, step, half_life, out):  # pragma: no cover - JIT
+    """Write importance * 0.5 ** ((step - added_at) / half_life) for every row into out."""
+    for i in range(importance.shape[0]):
+        steps_elapsed = step - added_at[i]
+        if steps_elapsed:
+            out[i] = importance[i] * 0.5 ** (steps_elapsed / half_life)
+        else:
+            out[i] = importance[i]
+
+
+@njit(cache=True)
+def select_at_least(weights, threshold, out):  # pragma: no cover - JIT
+    """Write the indices of weights >= threshold into out, in order; return how many."""
+    count = 0
+    for i in range(weights.shape[0]):
+        if weights[i] >= threshold:
+            out[count] = i
+            count += 1
+    return count
@@ -28,19 +28,78 @@ Mathematical Model:
     - half_life: Steps required for weight to decay to 50% of importance
 """
 
+import heapq
 import math
+import time
+from array import array
+from collections import deque
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 # Import cost tracking if available
 try:
     from .cost_optimization.cost_tracker import CostTracker
-    from .cost_optimization.token_counter import TokenCounter
 
     COST_TRACKING_AVAILABLE = True
 except ImportError:
     COST_TRACKING_AVAILABLE = False
 
+# Below this many items the plain Python loops are faster than NumPy's per-call overhead.
+_VECTORIZE_MIN_ITEMS = 64
+
+# Only the most recent cost events are kept; lifetime totals are tracked separately.
+_COST_HISTORY_LIMIT = 256
+
+# The prune heap is rebuilt from the columns once its stale entries outnumber live items
+# by this much, which keeps it within a constant factor of the item count.
+_PRUNE_HEAP_SLACK = 64
+
+# Numba is slow to import and compile, so its kernels are loaded on first vectorized use
+# rather than with this module. None means not tried yet, False means Numba is missing.
+_numba_module: Any = None
+
+
+def _numba_kernels() -> Any:
+    """Return the optional Numba kernel module, or None when Numba is not installed."""
+    global _numba_module
+    if _numba_module is None:
+        try:
+            from . import _kernels
+        except ImportError:
+            _numba_module = False
+        else:
+            _numba_module = _kernels
+    return _numba_module or None
+
+
+def _rows_at_least(weights: "np.ndarray", threshold: float) -> "np.ndarray":
+    """Indices of the weights >= threshold, in row order."""
+    kernels = _numba_kernels()
+    if kernels is None:
+        return np.flatnonzero(weights >= threshold)
+    rows = np.empty(len(weights), dtype=np.intp)
+    return rows[: kernels.select_at_least(weights, threshold, rows)]
+
+
+def _gather_in_place(column: array, rows: "np.ndarray", start: int = 0) -> None:
+    """Shrink ``column`` to the given ascending rows, reusing its buffer.
+
+    ``rows[:start]`` must already be in place (``rows[j] == j``); only the rest is moved.
+    """
+    view = np.frombuffer(column, dtype=column.typecode)
+    view[start : len(rows)] = view[rows[start:]]
+    # The view pins the buffer; drop it before the array is resized
+    del view
+    del column[len(rows) :]
+
 
 class ContextDecay:
     """
@@ -79,12 +138,43 @@ class ContextDecay:
         >>> decay = ContextDecay(half_life_steps=10, decay_function=linear_decay)
     """
 
+    # Items live in the column attributes below rather than in per-item dicts, so the
+    # only per-instance overhead left is the instance itself; slots drop its __dict__.
+    __slots__ = (
+        "half_life_steps",
+        "current_step",
+        "_keys",
+        "_values",
+        "_index",
+        "_importance",
+        "_added_at",
+        "_storage_cost",
+        "_cost_effectiveness",
+        "_weight",
+        "_weight_step",
+        "_cost_optimization",
+        "_max_context_cost",
+        "_current_cost",
+        "_cost_history",
+        "_items_pruned_total",
+        "_cost_saved_total",
+        "_prune_heap",
+        "_insert_seq",
+        "_next_seq",
+        "_cost_tracker",
+        "_decay_function",
+        "_fast_path",
+        "_refresh_weights",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         half_life_steps: int,
         decay_function: Optional[Callable[[float, int, int], float]] = None,
         cost_optimization: bool = False,
         max_context_cost: float = 1.0,
+        cost_tracker: Optional[Any] = None,
     ):
         """
         Initialize context decay manager.
@@ -93,8 +183,11 @@ class ContextDecay:
             half_life_steps: Number of steps for items to decay to 50% of original importance
             decay_function: Optional custom decay function. Defaults to exponential decay.
                            Function signature: (importance, steps_elapsed, half_life) -> current_weight
+                           Results are cached, so it is called at most once per item per step.
             cost_optimization: Enable cost-based context management and pruning
             max_context_cost: Maximum cost allowed for context storage (in dollars)
+            cost_tracker: Cost tracker to record storage costs into, e.g. one shared by
+                          several instances (default: a tracker owned by this instance)
 
         Raises:
             ValueError: If half_life_steps <= 0
@@ -112,27 +205,64 @@ class ContextDecay:
 
         self.half_life_steps = half_life_steps
         self.current_step = 0
-        self._items: Dict[str, Dict[str, Any]] = {}
+
+        # Items are stored column-wise: row i of every column belongs to self._keys[i]
+        # and self._index maps each key back to its row. Rows stay in insertion order.
+        # Numeric columns are 64-bit on purpose: importances and weights are handed back to
+        # callers, storage costs are subtracted from the running budget, and timestamps may
+        # be caller-supplied, so narrower types would leak rounding or overflow into results.
+        self._keys: List[str] = []
+        self._values: List[Any] = []
+        self._index: Dict[str, int] = {}
+        self._importance = array("d")
+        self._added_at = array("q")
+        self._storage_cost = array("d")
+        self._cost_effectiveness = array("d")
+
+        # The current weights are kept in their own column. It is recomputed at most once
+        # per step (on the first query after step()), so get_active, get_stats and friends
+        # share one pass between steps; self._weight_step is the step it is valid for.
+        self._weight = array("d")
+        self._weight_step = -1
 
         # Cost optimization settings
         self._cost_optimization = cost_optimization
         self._max_context_cost = max_context_cost
         self._current_cost = 0.0
-        self._cost_history: List[Dict[str, Any]] = []
-
-        # Initialize cost tracker if available and enabled
-        if cost_optimization and COST_TRACKING_AVAILABLE:
-            self._cost_tracker = CostTracker()
-            self._token_counter = TokenCounter()
-        else:
+        self._cost_history: Deque[Dict[str, Any]] = deque(maxlen=_COST_HISTORY_LIMIT)
+        self._items_pruned_total = 0
+        self._cost_saved_total = 0.0
+
+        # Min-heap of (cost_effectiveness, insertion sequence, key) for pruning. Updates
+        # and removals leave their old entries behind; pruning skips any entry that no
+        # longer matches the columns instead of searching the heap for it. The sequence
+        # column records when each row was first inserted, so ties still go oldest first.
+        # Both are only maintained with cost optimization on.
+        self._prune_heap: List[Tuple[float, int, str]] = []
+        self._insert_seq = array("q")
+        self._next_seq = 0
+
+        # Initialize cost tracker if enabled: the caller's, or one of our own if available
+        if not cost_optimization:
             self._cost_tracker = None
-            self._token_counter = None
+        elif cost_tracker is not None:
+            self._cost_tracker = cost_tracker
+        else:
+            self._cost_tracker = CostTracker() if COST_TRACKING_AVAILABLE else None
 
         if decay_function is None:
             self._decay_function = self._exponential_decay
         else:
             self._decay_function = decay_function
 
+        # Pick the refresh implementation once instead of branching on every query: the
+        # built-in decay is evaluated for all items at once, a custom one item by item
+        self._fast_path = decay_function is None
+        if self._fast_path:
+            self._refresh_weights = self._refresh_weights_fast
+        else:
+            self._refresh_weights = self._refresh_weights_custom
+
     def add(
         self,
         key: str,
@@ -165,11 +295,15 @@ class ContextDecay:
         if not 0.0 <= importance <= 1.0:
             raise ValueError(f"Importance must be between 0.0 and 1.0, got {importance}")
 
+        # add() runs once per item, so read the attributes it needs into locals once
+        step = self.current_step
+        cost_optimization = self._cost_optimization
+
         if timestamp is None:
-            timestamp = self.current_step
+            timestamp = step
 
         # Check cost constraints if cost optimization is enabled
-        if self._cost_optimization and storage_cost > 0:
+        if cost_optimization and storage_cost > 0:
             # Check if adding this item would exceed budget
             if self._current_cost + storage_cost > self._max_context_cost:
                 self._prune_by_cost_effectiveness()
@@ -181,26 +315,60 @@ class ContextDecay:
                 adjusted_importance = min(importance, cost_efficiency * 0.1)
                 importance = max(0.1, adjusted_importance)  # Minimum viable importance
 
-        # Remove existing item cost if updating
-        if key in self._items and self._cost_optimization:
-            self._current_cost -= self._items[key].get("storage_cost", 0.0)
-
-        self._items[key] = {
-            "value": value,
-            "importance": importance,
-            "added_at": timestamp,
-            "storage_cost": storage_cost,
-            "cost_effectiveness": importance / max(storage_cost, 0.001)
-            if storage_cost > 0
-            else importance,
-        }
+        # Keep the cached weight column valid; if it is stale it gets recomputed anyway
+        weight = 0.0
+        if self._weight_step == step:
+            steps_elapsed = step - timestamp
+            if not self._fast_path:
+                weight = self._decay_function(importance, steps_elapsed, self.half_life_steps)
+            elif steps_elapsed:
+                weight = importance * (0.5 ** (steps_elapsed / self.half_life_steps))
+            else:
+                weight = importance
+
+        # Importance bought per unit of storage cost, used to pick what to prune first
+        cost_effectiveness = (
+            importance / max(storage_cost, 0.001) if storage_cost > 0 else importance
+        )
+
+        index = self._index
+        row = index.get(key)
+        if row is not None:
+            reprioritized = False
+            # Remove existing item cost if updating
+            if cost_optimization:
+                self._current_cost -= self._storage_cost[row]
+                if self._cost_effectiveness[row] != cost_effectiveness:
+                    reprioritized = True
+
+            self._values[row] = value
+            self._importance[row] = importance
+            self._added_at[row] = timestamp
+            self._storage_cost[row] = storage_cost
+            self._cost_effectiveness[row] = cost_effectiveness
+            self._weight[row] = weight
+            if reprioritized:
+                self._push_prune_candidate(row)
+        else:
+            index[key] = len(index)
+            self._keys.append(key)
+            self._values.append(value)
+            self._importance.append(importance)
+            self._added_at.append(timestamp)
+            self._storage_cost.append(storage_cost)
+            self._cost_effectiveness.append(cost_effectiveness)
+            self._weight.append(weight)
+            if cost_optimization:
+                self._insert_seq.append(self._next_seq)
+                self._next_seq += 1
+                self._push_prune_candidate(index[key])
 
         # Update current cost
-        if self._cost_optimization:
+        if cost_optimization:
             self._current_cost += storage_cost
 
-            # Record cost event
-            if self._cost_tracker:
+            # Record cost event; free items have nothing to account for
+            if storage_cost > 0 and self._cost_tracker is not None:
                 self._cost_tracker.record_usage(
                     operation="context_storage",
                     tokens_used=int(storage_cost * 1000),  # Rough conversion
@@ -208,6 +376,135 @@ class ContextDecay:
                     model="storage",
                 )
 
+    def add_many(
+        self,
+        keys: Sequence[str],
+        values: Sequence[Any],
+        importances: Optional[Sequence[float]] = None,
+        timestamp: Optional[int] = None,
+        storage_costs: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Add or update a batch of context items at once.
+
+        Equivalent to calling add() for each item, except that the cost budget is
+        checked, and pruned if needed, once for the whole batch rather than per item.
+        If a key appears more than once, its last occurrence wins.
+
+        Args:
+            keys: Unique identifiers for the context items
+            values: The context data to store, one per key
+            importances: Initial importance scores (0.0-1.0, default: 1.0 for all)
+            timestamp: Optional step when the items were added (default: current_step)
+            storage_costs: Cost to store each item (default: 0.0 for all)
+
+        Raises:
+            ValueError: If the sequences differ in length or an importance is not in
+                range [0.0, 1.0]; nothing is added in that case
+
+        Examples:
+            >>> decay = ContextDecay(half_life_steps=15)
+            >>> decay.add_many(["search", "weather"], ["3 results", "sunny"], [0.6, 0.4])
+        """
+        count = len(keys)
+        if importances is None:
+            importances = [1.0] * count
+        if storage_costs is None:
+            storage_costs = [0.0] * count
+        if not len(values) == len(importances) == len(storage_costs) == count:
+            raise ValueError(
+                "keys, values, importances and storage_costs must have the same length"
+            )
+        for importance in importances:
+            if not 0.0 <= importance <= 1.0:
+                raise ValueError(f"Importance must be between 0.0 and 1.0, got {importance}")
+
+        step = self.current_step
+        cost_optimization = self._cost_optimization
+
+        if timestamp is None:
+            timestamp = step
+
+        # Check cost constraints once for the whole batch
+        batch_cost = math.fsum(storage_costs) if cost_optimization else 0.0
+        if batch_cost > 0:
+            if self._current_cost + batch_cost > self._max_context_cost:
+                self._prune_by_cost_effectiveness()
+
+            # If still over budget after pruning, adjust importance of the costed items
+            if self._current_cost + batch_cost > self._max_context_cost:
+                importances = [
+                    max(0.1, min(importance, importance / max(storage_cost, 0.001) * 0.1))
+                    if storage_cost > 0
+                    else importance
+                    for importance, storage_cost in zip(importances, storage_costs)
+                ]
+
+        index = self._index
+        first_new = len(self._keys)
+        new_keys: List[str] = []
+        new_values: List[Any] = []
+        new_importance: List[float] = []
+        new_storage_cost: List[float] = []
+        new_cost_effectiveness: List[float] = []
+        cost_delta = 0.0
+
+        for key, value, importance, storage_cost in zip(keys, values, importances, storage_costs):
+            cost_effectiveness = (
+                importance / max(storage_cost, 0.001) if storage_cost > 0 else importance
+            )
+            cost_delta += storage_cost
+            row = index.get(key)
+            if row is None:
+                index[key] = first_new + len(new_keys)
+                new_keys.append(key)
+                new_values.append(value)
+                new_importance.append(importance)
+                new_storage_cost.append(storage_cost)
+                new_cost_effectiveness.append(cost_effectiveness)
+            elif row >= first_new:
+                # Repeated key within this batch: overwrite the pending row
+                pending = row - first_new
+                cost_delta -= new_storage_cost[pending]
+                new_values[pending] = value
+                new_importance[pending] = importance
+                new_storage_cost[pending] = storage_cost
+                new_cost_effectiveness[pending] = cost_effectiveness
+            else:
+                cost_delta -= self._storage_cost[row]
+                self._values[row] = value
+                self._importance[row] = importance
+                self._added_at[row] = timestamp
+                self._storage_cost[row] = storage_cost
+                self._cost_effectiveness[row] = cost_effectiveness
+
+        # Append every new row to each column in one call
+        added = len(new_keys)
+        self._keys.extend(new_keys)
+        self._values.extend(new_values)
+        self._importance.extend(new_importance)
+        self._added_at.extend([timestamp] * added)
+        self._storage_cost.extend(new_storage_cost)
+        self._cost_effectiveness.extend(new_cost_effectiveness)
+        self._weight.extend([0.0] * added)
+        # Recompute every weight on the next read instead of patching rows one by one
+        self._weight_step = -1
+
+        if cost_optimization:
+            self._current_cost += cost_delta
+            self._insert_seq.extend(range(self._next_seq, self._next_seq + added))
+            self._next_seq += added
+            for key in dict.fromkeys(keys):
+                self._push_prune_candidate(index[key])
+
+            if batch_cost > 0 and self._cost_tracker is not None:
+                self._cost_tracker.record_usage(
+                    operation="context_storage",
+                    tokens_used=int(batch_cost * 1000),  # Rough conversion
+                    agent_id="context_manager",
+                    model="storage",
+                )
+
     def step(self) -> None:
         """
         Advance time by one step, causing all items to decay.
@@ -226,17 +523,25 @@ class ContextDecay:
         """
         self.current_step += 1
 
-    def get_active(self, threshold: float = 0.3) -> List[Tuple[str, Any, float]]:
+    def get_active(
+        self, threshold: float = 0.3, top_k: Optional[int] = None
+    ) -> List[Tuple[str, Any, float]]:
         """
         Return context items with current weight above threshold.
 
         Args:
             threshold: Minimum weight for items to be considered active (0.0-1.0)
+            top_k: Optional cap on the number of items returned. Only the heaviest
+                   top_k items are selected and sorted, which is much cheaper than
+                   sorting every active item when the store is large.
 
         Returns:
             List of tuples: (key, value, current_weight) for items above threshold,
             sorted by current weight in descending order
 
+        Raises:
+            ValueError: If top_k is negative
+
         Examples:
             >>> decay = ContextDecay(half_life_steps=5)
             >>> decay.add("recent", "important_data", importance=1.0)
@@ -248,17 +553,19 @@ class ContextDecay:
             >>>
             >>> active = decay.get_active(threshold=0.4)
             >>> # Returns only items with weight > 0.4
+            >>>
+            >>> top = decay.get_active(threshold=0.0, top_k=1)
+            >>> # Returns just the most relevant item
         """
-        active_items = []
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"top_k must be non-negative, got {top_k}")
 
-        for key, item in self._items.items():
-            current_weight = self._calculate_current_weight(item)
-            if current_weight >= threshold:
-                active_items.append((key, item["value"], current_weight))
+        rows, weights = self._ranked_rows(self._weights_all(), threshold, top_k)
 
-        # Sort by weight descending (most relevant first)
-        active_items.sort(key=lambda x: x[2], reverse=True)
-        return active_items
+        # Gather through C-level map/zip rather than indexing row by row in Python
+        return list(
+            zip(map(self._keys.__getitem__, rows), map(self._values.__getitem__, rows), weights)
+        )
 
     def get_all_items(self) -> List[Tuple[str, Any, float, float]]:
         """
@@ -277,15 +584,16 @@ class ContextDecay:
             >>> for key, value, weight, importance in all_items:
             ...     print(f"{key}: weight={weight:.2f}, importance={importance:.2f}")
         """
-        all_items = []
-
-        for key, item in self._items.items():
-            current_weight = self._calculate_current_weight(item)
-            all_items.append((key, item["value"], current_weight, item["importance"]))
-
-        # Sort by weight descending (most relevant first)
-        all_items.sort(key=lambda x: x[2], reverse=True)
-        return all_items
+        rows, weights = self._ranked_rows(self._weights_all())
+
+        return list(
+            zip(
+                map(self._keys.__getitem__, rows),
+                map(self._values.__getitem__, rows),
+                weights,
+                map(self._importance.__getitem__, rows),
+            )
+        )
 
     def clear_expired(self, threshold: float = 0.1) -> int:
         """
@@ -309,17 +617,19 @@ class ContextDecay:
             >>> removed = decay.clear_expired(threshold=0.05)
             >>> # Returns number of expired items removed
         """
-        to_remove = []
-
-        for key, item in self._items.items():
-            current_weight = self._calculate_current_weight(item)
-            if current_weight < threshold:
-                to_remove.append(key)
+        weights = self._weights_all()
+        if isinstance(weights, list):
+            keep = [row for row, weight in enumerate(weights) if weight >= threshold]
+        else:
+            keep = _rows_at_least(weights, threshold)
 
-        for key in to_remove:
-            del self._items[key]
+        removed = len(weights) - len(keep)
+        # Release the view of the weight column so it can be compacted in place
+        del weights
+        if removed:
+            self._compact(keep)
 
-        return len(to_remove)
+        return removed
 
     def get_stats(self) -> Dict[str, float]:
         """
@@ -341,34 +651,186 @@ class ContextDecay:
             >>> stats = decay.get_stats()
             >>> # {'total_items': 2, 'active_items': 2, 'avg_decay': 0.87, 'oldest_age': 1}
         """
-        if not self._items:
+        if not self._keys:
             return {"total_items": 0, "active_items": 0, "avg_decay": 0.0, "oldest_age": 0}
 
-        weights = []
-        ages = []
-        active_count = 0
+        weights = self._weights_all()
+        if isinstance(weights, list):
+            active_items = sum(1 for weight in weights if weight >= 0.3)  # Default threshold
+            avg_decay = sum(weights) / len(weights)
+            oldest_added_at = min(self._added_at)
+        else:
+            # Contiguous single-pass reductions over the columns
+            active_items = int(np.count_nonzero(weights >= 0.3))  # Default threshold
+            avg_decay = float(weights.mean())
+            oldest_added_at = int(np.frombuffer(self._added_at, dtype=np.int64).min())
 
-        for item in self._items.values():
-            weight = self._calculate_current_weight(item)
-            age = self.current_step - item["added_at"]
+        return {
+            "total_items": len(weights),
+            "active_items": active_items,
+            "avg_decay": avg_decay,
+            "oldest_age": self.current_step - oldest_added_at,
+        }
 
-            weights.append(weight)
-            ages.append(age)
+    def _weights_all(self) -> Sequence[float]:
+        """
+        Current weight of every item, in row order.
 
-            if weight >= 0.3:  # Default threshold
-                active_count += 1
+        This is the cached weight column, refreshed at most once per step and returned as
+        a zero-copy NumPy view when there are enough items to vectorize, otherwise a list.
+        """
+        vectorize = NUMPY_AVAILABLE and len(self._keys) >= _VECTORIZE_MIN_ITEMS
+        if self._weight_step != self.current_step:
+            self._refresh_weights(vectorize)
+        if vectorize:
+            return np.frombuffer(self._weight, dtype=np.float64)
+        return self._weight.tolist()
+
+    def _refresh_weights_custom(self, vectorize: bool) -> None:
+        """Recompute the weight column for the current step with the custom decay."""
+        step = self.current_step
+        half_life = self.half_life_steps
+        decay_function = self._decay_function
+        self._weight = array(
+            "d",
+            [
+                decay_function(importance, step - added_at, half_life)
+                for importance, added_at in zip(self._importance, self._added_at)
+            ],
+        )
+        self._weight_step = step
+
+    def _refresh_weights_fast(self, vectorize: bool) -> None:
+        """Recompute the weight column for the current step with the built-in decay."""
+        step = self.current_step
+        half_life = self.half_life_steps
+        if vectorize:
+            # Zero-copy views of the columns, filled in one pass instead of a pow per item
+            importance = np.frombuffer(self._importance, dtype=np.float64)
+            added_at = np.frombuffer(self._added_at, dtype=np.int64)
+            weights = np.frombuffer(self._weight, dtype=np.float64)
+            kernels = _numba_kernels()
+            if kernels is not None:
+                kernels.decay_weights(importance, added_at, step, half_life, weights)
+            else:
+                # NumPy's vectorized pow can round differently from the 0.5 ** x that
+                # add(), the loop below and the Numba kernel use, so each distinct age's
+                # factor is computed with Python's pow and gathered for every row. Ages
+                # are whole steps, so there are rarely more of them than rows.
+                ages = step - added_at
+                low = int(ages.min())
+                span = int(ages.max()) - low + 1
+                if span <= len(ages):
+                    distinct = range(low, low + span)
+                    rows = ages - low
+                else:
+                    distinct, rows = np.unique(ages, return_inverse=True)
+                    distinct = distinct.tolist()
+                factors = np.array([0.5 ** (age / half_life) for age in distinct])
+                np.multiply(importance, factors[rows], out=weights)
+        else:
+            self._weight = array(
+                "d",
+                [
+                    importance * (0.5 ** ((step - added_at) / half_life))
+                    for importance, added_at in zip(self._importance, self._added_at)
+                ],
+            )
+        self._weight_step = step
 
-        return {
-            "total_items": len(self._items),
-            "active_items": active_count,
-            "avg_decay": sum(weights) / len(weights),
-            "oldest_age": max(ages) if ages else 0,
-        }
+    @staticmethod
+    def _ranked_rows(
+        weights: Sequence[float], threshold: Optional[float] = None, top_k: Optional[int] = None
+    ) -> Tuple[List[int], List[float]]:
+        """
+        Rows with weight >= threshold (all rows if None), heaviest first, and their weights.
 
-    def _calculate_current_weight(self, item: Dict[str, Any]) -> float:
-        """Calculate current weight of an item based on decay function."""
-        steps_elapsed = self.current_step - item["added_at"]
-        return self._decay_function(item["importance"], steps_elapsed, self.half_life_steps)
+        With top_k only the first top_k of that ranking are returned; ties keep insertion
+        order either way, so the result always equals the full ranking cut to top_k.
+        """
+        if isinstance(weights, list):
+            if threshold is None:
+                rows = list(range(len(weights)))
+            else:
+                rows = [row for row, weight in enumerate(weights) if weight >= threshold]
+            if top_k is not None and top_k < len(rows):
+                # Same order as the sort below, without sorting the rows that are cut
+                rows = heapq.nlargest(top_k, rows, key=weights.__getitem__)
+            else:
+                # Sort by weight descending (most relevant first); ties keep insertion order
+                rows.sort(key=weights.__getitem__, reverse=True)
+            return rows, [weights[row] for row in rows]
+
+        if threshold is None:
+            selected = np.arange(len(weights))
+        else:
+            selected = _rows_at_least(weights, threshold)
+        if top_k is not None and top_k < len(selected):
+            if top_k == 0:
+                return [], []
+            # Partition to find the k-th largest weight, then keep only rows at or above
+            # it (ties included, in row order) so the final stable sort stays small
+            selected_weights = weights[selected]
+            kth = np.partition(selected_weights, len(selected) - top_k)[len(selected) - top_k]
+            selected = selected[selected_weights >= kth]
+        selected = selected[np.argsort(-weights[selected], kind="stable")][:top_k]
+        return selected.tolist(), weights[selected].tolist()
+
+    def _compact(self, rows: Sequence[int]) -> None:
+        """
+        Keep only the given rows (ascending) and update the key index to match.
+
+        Rows before the first removed one stay where they are, so only the displaced
+        suffix is rewritten and only its keys get new index entries.
+        """
+        columns = (
+            self._importance,
+            self._added_at,
+            self._storage_cost,
+            self._cost_effectiveness,
+            self._weight,
+        )
+        if self._cost_optimization:
+            columns += (self._insert_seq,)
+        total_rows = len(self._keys)
+        kept_rows = len(rows)
+        if NUMPY_AVAILABLE and total_rows >= _VECTORIZE_MIN_ITEMS:
+            rows = np.asarray(rows, dtype=np.intp)
+            displaced = np.flatnonzero(rows != np.arange(kept_rows))
+            start = int(displaced[0]) if len(displaced) else kept_rows
+            # One fancy-index gather per column, written back over the column's own buffer
+            for column in columns:
+                _gather_in_place(column, rows, start)
+            dropped = np.ones(total_rows - start, dtype=bool)
+            dropped[rows[start:] - start] = False
+            removed = (np.flatnonzero(dropped) + start).tolist()
+            moved = rows[start:].tolist()
+        else:
+            start = next((j for j, row in enumerate(rows) if row != j), kept_rows)
+            moved = list(rows[start:])
+            for column in columns:
+                column[start:] = array(column.typecode, map(column.__getitem__, moved))
+            kept = set(moved)
+            removed = [row for row in range(start, total_rows) if row not in kept]
+
+        index = self._index
+        for key in map(self._keys.__getitem__, removed):
+            del index[key]
+        self._keys[start:] = map(self._keys.__getitem__, moved)
+        self._values[start:] = map(self._values.__getitem__, moved)
+        for row, key in enumerate(islice(self._keys, start, None), start):
+            index[key] = row
+
+    def _push_prune_candidate(self, row: int) -> None:
+        """Record the row's current cost effectiveness in the prune heap."""
+        heap = self._prune_heap
+        heapq.heappush(
+            heap, (self._cost_effectiveness[row], self._insert_seq[row], self._keys[row])
+        )
+        if len(heap) > 2 * len(self._keys) + _PRUNE_HEAP_SLACK:
+            # Mostly stale entries: rebuild from the live rows
+            heap[:] = zip(self._cost_effectiveness, self._insert_seq, self._keys)
+            heapq.heapify(heap)
 
     def _exponential_decay(self, importance: float, steps_elapsed: int, half_life: int) -> float:
         """Default exponential decay function."""
@@ -378,38 +840,59 @@ class ContextDecay:
         """
         Remove items with lowest cost effectiveness to free up budget.
         """
-        if not self._cost_optimization or not self._items:
+        if not self._cost_optimization or not self._keys:
             return
 
-        # Sort items by cost effectiveness (ascending - least effective first)
-        items_by_effectiveness = sorted(
-            self._items.items(), key=lambda x: x[1].get("cost_effectiveness", 0.0)
-        )
-
-        # Remove items until we're under budget or have room for new items
+        # Pop rows from the least cost-effective end until under budget, skipping heap
+        # entries left behind by updates and removals
         target_cost = self._max_context_cost * 0.8  # Leave 20% buffer
-        removed_items = []
-
-        for key, item in items_by_effectiveness:
-            if self._current_cost <= target_cost:
-                break
-
-            self._current_cost -= item.get("storage_cost", 0.0)
-            removed_items.append(key)
-            del self._items[key]
+        heap = self._prune_heap
+        index = self._index
+        cost_effectiveness = self._cost_effectiveness
+        insert_seq = self._insert_seq
+        removed_rows: List[int] = []
+        taken = set()
+        cost_freed = 0.0
+
+        while self._current_cost > target_cost and heap:
+            effectiveness, seq, key = heapq.heappop(heap)
+            row = index.get(key)
+            if (
+                row is None
+                or insert_seq[row] != seq
+                or cost_effectiveness[row] != effectiveness
+                or row in taken
+            ):
+                continue
+            taken.add(row)
+            removed_rows.append(row)
+            # Tally the freed cost now; the rows are gone once compacted
+            storage_cost = self._storage_cost[row]
+            self._current_cost -= storage_cost
+            cost_freed += storage_cost
+
+        if removed_rows:
+            # Drop the removed rows with a single compaction of every column
+            total_rows = len(self._keys)
+            if NUMPY_AVAILABLE and total_rows >= _VECTORIZE_MIN_ITEMS:
+                keep = np.ones(total_rows, dtype=bool)
+                keep[removed_rows] = False
+                self._compact(np.flatnonzero(keep))
+            else:
+                self._compact([row for row in range(total_rows) if row not in taken])
 
         # Record pruning event
-        if removed_items and self._cost_tracker:
-            self._cost_history.append(
-                {
-                    "timestamp": datetime.now(),
-                    "action": "cost_pruning",
-                    "items_removed": len(removed_items),
-                    "cost_freed": sum(
-                        self._items.get(k, {}).get("storage_cost", 0.0) for k in removed_items
-                    ),
-                }
-            )
+        if removed_rows and self._cost_tracker is not None:
+            event = {
+                # Raw clock reading; converted to a datetime only when reported
+                "timestamp": time.time_ns(),
+                "action": "cost_pruning",
+                "items_removed": len(removed_rows),
+                "cost_freed": cost_freed,
+            }
+            self._cost_history.append(event)
+            self._items_pruned_total += event["items_removed"]
+            self._cost_saved_total += event["cost_freed"]
 
     def get_cost_report(self) -> Dict[str, Any]:
         """
@@ -421,7 +904,7 @@ class ContextDecay:
         if not self._cost_optimization:
             return {"error": "Cost optimization not enabled"}
 
-        total_items = len(self._items)
+        total_items = len(self._keys)
         if total_items == 0:
             return {
                 "total_items": 0,
@@ -430,18 +913,11 @@ class ContextDecay:
                 "cost_efficiency": 0.0,
             }
 
-        total_importance = sum(item["importance"] for item in self._items.values())
+        total_importance = sum(self._importance)
         total_cost = self._current_cost
-        items_pruned = sum(event.get("items_removed", 0) for event in self._cost_history)
-        cost_saved = sum(event.get("cost_freed", 0.0) for event in self._cost_history)
 
         # Calculate cost effectiveness distribution
-        effectiveness_scores = [
-            item.get("cost_effectiveness", 0.0) for item in self._items.values()
-        ]
-        avg_effectiveness = (
-            sum(effectiveness_scores) / len(effectiveness_scores) if effectiveness_scores else 0.0
-        )
+        avg_effectiveness = sum(self._cost_effectiveness) / total_items
 
         return {
             "total_items": total_items,
@@ -450,8 +926,11 @@ class ContextDecay:
             "budget_utilization": total_cost / self._max_context_cost,
             "average_cost_per_item": total_cost / total_items,
             "cost_efficiency": total_importance / max(total_cost, 0.001),
-            "items_pruned": items_pruned,
-            "cost_saved": cost_saved,
+            "items_pruned": self._items_pruned_total,
+            "cost_saved": self._cost_saved_total,
             "average_cost_effectiveness": avg_effectiveness,
-            "cost_history": self._cost_history[-10:],  # Last 10 cost events
+            "cost_history": [  # Last 10 cost events
+                {**event, "timestamp": datetime.fromtimestamp(event["timestamp"] / 1e9)}
+                for event in islice(self._cost_history, max(0, len(self._cost_history) - 10), None)
+            ],
         }
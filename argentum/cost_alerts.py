@@ -14,24 +14,42 @@ Examples:
     >>> alerts.check_thresholds(current_cost=850, budget=1000)
 """
 
+import bisect
 import html
+import importlib.util
+import ipaddress
 import json
 import logging
 import re
-import smtplib
-from dataclasses import dataclass
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any, Callable, Dict, List, Optional
+from itertools import chain, islice
+from string import Template
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-# Optional dependencies
-try:
+from .cost_optimization._compat import DATACLASS_SLOTS
+
+if TYPE_CHECKING:
+    import smtplib
+
     import requests
-    REQUESTS_AVAILABLE = True
+
+# Optional dependencies. requests, smtplib and email are only imported once an alert is
+# actually sent, so importing argentum does not pay for them.
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
 except ImportError:
-    REQUESTS_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 # Cost tracker integration (optional)
 COST_TRACKING_AVAILABLE = False
@@ -46,6 +64,23 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Worker threads that deliver notifications in the background
+_DISPATCH_WORKERS = 10
+
+_WEBHOOK_HEADERS = {"User-Agent": "Argentum-Alerts/1.0", "Content-Type": "application/json"}
+_WEBHOOK_TIMEOUT_SECONDS = 10
+
+# Connection pool sizing for the synchronous requests session
+_HTTP_POOL_CONNECTIONS = 10
+_HTTP_POOL_MAXSIZE = 50
+
+# SMTP connections are kept open between alerts. Each is retired after this many messages
+# or seconds, and at most _SMTP_POOL_SIZE idle connections are kept across all servers.
+_SMTP_POOL_SIZE = 5
+_SMTP_MESSAGES_PER_CONNECTION = 100
+_SMTP_CONNECTION_TTL_SECONDS = 100
+_SMTP_TIMEOUT_SECONDS = 10
+
 
 class SecurityError(Exception):
     """Security validation error."""
@@ -53,6 +88,20 @@ class SecurityError(Exception):
     pass
 
 
+# Webhook services recognised without a warning, matched on the whole hostname or a
+# subdomain of it (so "hooks.slack.com.attacker.io" is not one of them)
+_KNOWN_WEBHOOK_DOMAINS = frozenset(
+    (
+        "hooks.slack.com",
+        "discord.com",
+        "discordapp.com",
+        "outlook.office.com",
+        "teams.microsoft.com",
+    )
+)
+_KNOWN_WEBHOOK_SUBDOMAIN_SUFFIXES = tuple("." + domain for domain in _KNOWN_WEBHOOK_DOMAINS)
+
+
 def _validate_webhook_url(url: str) -> bool:
     """
     Validate webhook URL for security.
@@ -75,61 +124,158 @@ def _validate_webhook_url(url: str) -> bool:
     if parsed.scheme not in ["https"]:
         raise SecurityError("Only HTTPS webhooks are allowed for security")
 
+    hostname = parsed.hostname
+    if not hostname:
+        return True
+
     # Block private/internal addresses
-    if parsed.hostname:
-        if parsed.hostname in ["localhost", "127.0.0.1", "0.0.0.0"]:
+    if hostname == "localhost":
+        raise SecurityError("Private/localhost addresses not allowed")
+    try:
+        address = ipaddress.ip_address(hostname)
+    except ValueError:
+        address = None  # A DNS name rather than an IP literal
+    if address is not None:
+        if address.is_loopback or address.is_unspecified:
             raise SecurityError("Private/localhost addresses not allowed")
-        if parsed.hostname.startswith("10.") or parsed.hostname.startswith("192.168."):
+        if address.is_private or address.is_link_local:
             raise SecurityError("Private network addresses not allowed")
 
     # Check for known webhook services (optional but recommended)
-    allowed_domains = [
-        "hooks.slack.com",
-        "discord.com",
-        "discordapp.com",
-        "outlook.office.com",
-        "teams.microsoft.com",
-    ]
-
-    if parsed.hostname and not any(domain in parsed.hostname for domain in allowed_domains):
-        logger.warning(f"Unknown webhook domain: {parsed.hostname}")
+    if hostname not in _KNOWN_WEBHOOK_DOMAINS and not hostname.endswith(
+        _KNOWN_WEBHOOK_SUBDOMAIN_SUFFIXES
+    ):
+        logger.warning(f"Unknown webhook domain: {hostname}")
 
     return True
 
 
+# Format specifiers that could reach object internals, combined into one regex so a
+# template is scanned once; the group that matched identifies the pattern
+_DANGEROUS_TEMPLATE_PATTERNS = (
+    r"__\w+__",  # Dunder attributes
+    r"{.*\[.*\]}",  # Index access
+    r"{.*\.__.*}",  # Attribute access
+    r"{.*exec.*}",  # Code execution
+    r"{.*eval.*}",  # Code evaluation
+)
+_DANGEROUS_TEMPLATE_RE = re.compile(
+    "|".join(f"({pattern})" for pattern in _DANGEROUS_TEMPLATE_PATTERNS)
+)
+
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+
+# HTML part of alert emails; only the figures change between alerts
+_EMAIL_HTML_TEMPLATE = Template(
+    """
+        <html>
+          <body>
+            <h2>🚨 Argentum Cost Alert</h2>
+            <p><strong>Current Cost:</strong> $$$cost</p>
+            <p><strong>Budget:</strong> $$$budget</p>
+            <p><strong>Threshold:</strong> $$$threshold</p>
+            <p><strong>Time:</strong> $time</p>
+            <hr>
+            <p style="color: #666;">This is an automated alert from Argentum cost monitoring.</p>
+          </body>
+        </html>
+        """
+)
+
+
 def _sanitize_message_template(template: str) -> str:
     """
     Sanitize message template to prevent injection attacks.
 
+    The template is not HTML-escaped: webhook payloads are JSON and the email body is
+    plain text, so escaping would only show up as literal entities such as "&amp;".
+
     Args:
         template: Message template string
 
     Returns:
         Sanitized template
     """
-    # Escape HTML characters
-    template = html.escape(template)
-
     # Limit template length
     if len(template) > 1000:
         raise SecurityError("Message template too long (max 1000 characters)")
 
     # Block dangerous format specifiers
-    dangerous_patterns = [
-        r"__\w+__",  # Dunder attributes
-        r"{.*\[.*\]}",  # Index access
-        r"{.*\.__.*}",  # Attribute access
-        r"{.*exec.*}",  # Code execution
-        r"{.*eval.*}",  # Code evaluation
-    ]
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, template):
-            raise SecurityError(f"Dangerous pattern detected in template: {pattern}")
+    match = _DANGEROUS_TEMPLATE_RE.search(template)
+    if match:
+        pattern = _DANGEROUS_TEMPLATE_PATTERNS[match.lastindex - 1]
+        raise SecurityError(f"Dangerous pattern detected in template: {pattern}")
 
     return template
 
 
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a webhook payload to JSON bytes, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+def _coalesce_notifications(pending: List[tuple]) -> List[tuple]:
+    """
+    Group (channel, message, alert_event) notifications into (channel, notifications) jobs.
+
+    Channels added with batch=True that post to the same destination share one job;
+    every other notification gets a job of its own. Jobs keep the order of their first
+    notification.
+    """
+    jobs = []
+    batches: Dict[tuple, tuple] = {}
+    for channel, message, alert_event in pending:
+        if channel.get("batch"):
+            key = (channel["type"], channel["url"], channel.get("channel"))
+            job = batches.get(key)
+            if job is not None:
+                job[1].append((message, alert_event))
+                continue
+            job = batches[key] = (channel, [(message, alert_event)])
+        else:
+            job = (channel, [(message, alert_event)])
+        jobs.append(job)
+    return jobs
+
+
+def _smtp_key(smtp_config: Dict[str, Any]) -> Tuple[str, int, str]:
+    """Pool key for an SMTP configuration."""
+    return (smtp_config["host"], smtp_config["port"], smtp_config.get("username") or "")
+
+
+def _open_smtp(smtp_config: Dict[str, Any]) -> "smtplib.SMTP":
+    """Connect, secure and authenticate a new SMTP connection."""
+    import smtplib
+
+    host, port = smtp_config["host"], smtp_config["port"]
+    if smtp_config.get("use_ssl"):
+        connection = smtplib.SMTP_SSL(host, port, timeout=_SMTP_TIMEOUT_SECONDS)
+    else:
+        connection = smtplib.SMTP(host, port, timeout=_SMTP_TIMEOUT_SECONDS)
+    try:
+        if smtp_config.get("use_tls") and not smtp_config.get("use_ssl"):
+            connection.starttls()
+        if smtp_config.get("username"):
+            connection.login(smtp_config["username"], smtp_config.get("password", ""))
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def _quit_smtp(connection: "smtplib.SMTP") -> None:
+    """Close an SMTP connection, politely if the server is still there."""
+    import smtplib
+
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
 def _validate_email(email: str) -> bool:
     """
     Validate email address.
@@ -143,8 +289,7 @@ def _validate_email(email: str) -> bool:
     Raises:
         SecurityError: If email is invalid
     """
-    email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    if not re.match(email_pattern, email):
+    if not _EMAIL_RE.match(email):
         raise SecurityError("Invalid email format")
 
     if len(email) > 254:  # RFC 5321 limit
@@ -153,24 +298,20 @@ def _validate_email(email: str) -> bool:
     return True
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AlertRule:
     """Configuration for a cost alert rule."""
 
     name: str
     threshold: float  # 0.0-1.0 for percentage, or absolute dollar amount
     threshold_type: str = "percentage"  # "percentage" or "absolute"
-    channels: List[Dict[str, Any]] = None
+    channels: List[Dict[str, Any]] = field(default_factory=list)
     message_template: str = "Cost threshold reached: {cost} / {budget}"
     cooldown_minutes: int = 60  # Minimum time between alerts
     enabled: bool = True
 
-    def __post_init__(self):
-        if self.channels is None:
-            self.channels = []
-
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AlertEvent:
     """Record of a triggered alert."""
 
@@ -181,6 +322,118 @@ class AlertEvent:
     threshold_value: float
     message: str
     channels_notified: List[str]
+    utilization: Optional[float] = None  # current_cost / budget, None without a positive budget
+
+
+class _ThresholdIndex:
+    """
+    Rules of one threshold type, ascending by (threshold, registration order).
+
+    The index is kept as parallel columns rather than one tuple per rule, so the cut-off
+    for a cost is a bisect over a flat array of doubles instead of a walk through every
+    rule below it.
+    """
+
+    __slots__ = ("thresholds", "orders", "names")
+
+    def __init__(self):
+        self.thresholds = array("d")
+        self.orders: List[int] = []
+        self.names: List[str] = []
+
+    def insert(self, threshold: float, order: int, name: str) -> None:
+        thresholds = self.thresholds
+        lo = bisect.bisect_left(thresholds, threshold)
+        hi = bisect.bisect_right(thresholds, threshold, lo)
+        position = bisect.bisect_left(self.orders, order, lo, hi)
+        thresholds.insert(position, threshold)
+        self.orders.insert(position, order)
+        self.names.insert(position, name)
+
+    def remove(self, name: str) -> Optional[int]:
+        """Drop the named rule and return its registration order, or None if absent."""
+        try:
+            position = self.names.index(name)
+        except ValueError:
+            return None
+        del self.thresholds[position], self.names[position]
+        return self.orders.pop(position)
+
+    def count_reached(self, cost: float, scale: float = 1.0) -> int:
+        """Number of leading rules with cost >= scale * threshold, for scale >= 0."""
+        thresholds = self.thresholds
+        count = bisect.bisect_right(thresholds, cost / scale) if scale else 0
+        # cost / scale only estimates the cut-off; settle it on the exact comparison
+        while count < len(thresholds) and cost >= scale * thresholds[count]:
+            count += 1
+        while count and cost < scale * thresholds[count - 1]:
+            count -= 1
+        return count
+
+
+class AlertStateStore:
+    """
+    Records when each alert rule last fired, for cooldown checks.
+
+    This default keeps the times in memory, so cooldowns reset when the process
+    restarts. Subclass it and override get_last/set_last to persist them or share
+    them between workers, as RedisAlertStore does.
+    """
+
+    def __init__(self):
+        self._last_alert_times: Dict[str, datetime] = {}
+
+    def get_last(self, rule_name: str) -> Optional[datetime]:
+        """Return when the rule last fired, or None if it has not (or has expired)."""
+        return self._last_alert_times.get(rule_name)
+
+    def set_last(self, rule_name: str, triggered_at: datetime, ttl_seconds: int) -> None:
+        """
+        Record that the rule fired.
+
+        Args:
+            rule_name: Alert rule name
+            triggered_at: When the rule fired
+            ttl_seconds: How long the record matters (the rule's cooldown); stores
+                with expiry may drop it afterwards
+        """
+        self._last_alert_times[rule_name] = triggered_at
+
+
+class RedisAlertStore(AlertStateStore):
+    """
+    Alert state kept in Redis, so cooldowns survive restarts and are shared by workers.
+
+    Each rule is one key holding the epoch second it last fired, set with SETEX so it
+    expires once the cooldown is over.
+
+    Examples:
+        >>> import redis
+        >>> alerts = CostAlerts(state_store=RedisAlertStore(redis.Redis()))
+    """
+
+    def __init__(self, redis_client: Any, prefix: str = "argentum:alert:"):
+        """
+        Initialize the Redis-backed store.
+
+        Args:
+            redis_client: A redis-py compatible client
+            prefix: Prefix for the per-rule keys
+        """
+        self._redis = redis_client
+        self._prefix = prefix
+
+    def get_last(self, rule_name: str) -> Optional[datetime]:
+        value = self._redis.get(self._prefix + rule_name)
+        if value is None:
+            return None
+        return datetime.fromtimestamp(int(value))
+
+    def set_last(self, rule_name: str, triggered_at: datetime, ttl_seconds: int) -> None:
+        # SETEX needs a positive expiry; a zero cooldown suppresses nothing anyway
+        self._redis.setex(
+            self._prefix + rule_name, max(1, int(ttl_seconds)), int(triggered_at.timestamp())
+        )
 
 
 class CostAlerts:
@@ -191,17 +444,43 @@ class CostAlerts:
     with flexible threshold-based triggering and cooldown management.
     """
 
-    def __init__(self, cost_tracker: Optional[Any] = None):
+    def __init__(
+        self,
+        cost_tracker: Optional[Any] = None,
+        state_store: Optional[AlertStateStore] = None,
+        history_size: int = 10_000,
+    ):
         """
         Initialize cost alerts system.
 
         Args:
             cost_tracker: Optional cost tracker instance for automatic monitoring
+            state_store: Where rule cooldowns are recorded (default: in memory)
+            history_size: Number of recent alert events kept for get_alert_history
         """
         self._rules: Dict[str, AlertRule] = {}
-        self._alert_history: List[AlertEvent] = []
+        # Split by threshold type, so check_thresholds only looks at rules the cost reached
+        self._absolute_rules = _ThresholdIndex()
+        self._percentage_rules = _ThresholdIndex()
+        self._rules_registered = 0
+        self._alert_history: Deque[AlertEvent] = deque(maxlen=history_size)
         self._cost_tracker = cost_tracker
-        self._last_alert_times: Dict[str, datetime] = {}
+        self._state_store = state_store if state_store is not None else AlertStateStore()
+        self._http: Optional["requests.Session"] = None  # Created on first webhook
+        self._http_lock = threading.Lock()
+        # Notifications are delivered on these threads so check_thresholds never waits
+        # on the network; _outstanding holds deliveries that have not finished yet
+        self._executor = ThreadPoolExecutor(
+            max_workers=_DISPATCH_WORKERS, thread_name_prefix="alert-dispatch"
+        )
+        self._outstanding: Set[Future] = set()
+        self._outstanding_lock = threading.Lock()
+        # (host, port, username) -> idle [connection, messages left, monotonic time opened]
+        # entries, least recently used server first. _smtp_lock only guards the pool;
+        # connections are used with it released
+        self._smtp_pool: "OrderedDict[Tuple[str, int, str], List[list]]" = OrderedDict()
+        self._smtp_idle = 0
+        self._smtp_lock = threading.Lock()
 
     def add_webhook(
         self,
@@ -211,6 +490,7 @@ class CostAlerts:
         rule_name: str = None,
         threshold_type: str = "percentage",
         cooldown_minutes: int = 60,
+        batch: bool = False,
     ) -> str:
         """
         Add a webhook alert (Slack, Discord, Teams, etc.).
@@ -222,6 +502,8 @@ class CostAlerts:
             rule_name: Custom rule name (optional, auto-generated if not provided)
             threshold_type: "percentage" or "absolute"
             cooldown_minutes: Minimum time between alerts
+            batch: Combine alerts that fire in the same check into one request to this
+                URL, together with other batching rules for the same URL
 
         Returns:
             Rule name for later reference
@@ -249,7 +531,12 @@ class CostAlerts:
 
         message = _sanitize_message_template(message)
 
-        channel = {"type": "webhook", "url": url, "format": self._detect_webhook_format(url)}
+        channel = {
+            "type": "webhook",
+            "url": url,
+            "format": self._detect_webhook_format(url),
+            "batch": batch,
+        }
 
         rule = AlertRule(
             name=rule_name,
@@ -260,7 +547,7 @@ class CostAlerts:
             cooldown_minutes=cooldown_minutes,
         )
 
-        self._rules[rule_name] = rule
+        self._register_rule(rule)
         return rule_name
 
     def add_email(
@@ -331,7 +618,7 @@ This is an automated alert from Argentum cost monitoring.
             cooldown_minutes=60,
         )
 
-        self._rules[rule_name] = rule
+        self._register_rule(rule)
         return rule_name
 
     def add_slack_webhook(
@@ -341,6 +628,7 @@ This is an automated alert from Argentum cost monitoring.
         channel: str = None,
         username: str = "Argentum",
         icon_emoji: str = ":money_with_wings:",
+        batch: bool = False,
     ) -> str:
         """
         Add a Slack-specific webhook with rich formatting.
@@ -351,18 +639,27 @@ This is an automated alert from Argentum cost monitoring.
             channel: Slack channel override
             username: Bot username
             icon_emoji: Bot icon
+            batch: Post alerts that fire in the same check as one message with an
+                attachment each, together with other batching rules for the same URL
 
         Returns:
             Rule name
         """
         rule_name = f"slack_{len(self._rules) + 1}"
 
+        # The top-level payload fields never change, so they are built once here
+        payload_header = {"username": username, "icon_emoji": icon_emoji}
+        if channel:
+            payload_header["channel"] = channel
+
         channel_config = {
             "type": "slack",
             "url": webhook_url,
             "channel": channel,
             "username": username,
             "icon_emoji": icon_emoji,
+            "batch": batch,
+            "payload_header": payload_header,
         }
 
         rule = AlertRule(
@@ -374,7 +671,7 @@ This is an automated alert from Argentum cost monitoring.
             cooldown_minutes=30,
         )
 
-        self._rules[rule_name] = rule
+        self._register_rule(rule)
         return rule_name
 
     def check_thresholds(
@@ -383,6 +680,10 @@ This is an automated alert from Argentum cost monitoring.
         """
         Check all alert rules and trigger notifications.
 
+        Notifications are delivered on background threads; each event's
+        channels_notified fills in as its deliveries succeed. Call flush() to wait
+        for them.
+
         Args:
             current_cost: Current spending amount
             budget: Budget amount (required for percentage thresholds)
@@ -392,14 +693,17 @@ This is an automated alert from Argentum cost monitoring.
             List of triggered alert events
         """
         triggered_alerts = []
+        pending = []  # (channel, message, alert_event) for every notification to send
         now = datetime.now()
+        utilization = current_cost / budget if budget is not None and budget > 0 else None
 
-        for rule_name, rule in self._rules.items():
+        for rule_name in self._rules_reached(current_cost, budget):
+            rule = self._rules[rule_name]
             if not rule.enabled:
                 continue
 
             # Check cooldown
-            last_alert = self._last_alert_times.get(rule_name)
+            last_alert = self._state_store.get_last(rule_name)
             if last_alert:
                 cooldown_delta = now - last_alert
                 if cooldown_delta.total_seconds() < rule.cooldown_minutes * 60:
@@ -438,26 +742,67 @@ This is an automated alert from Argentum cost monitoring.
                     threshold_value=threshold_value,
                     message=message,
                     channels_notified=[],
+                    utilization=utilization,
                 )
 
-                # Send notifications
-                for channel in rule.channels:
-                    try:
-                        self._send_notification(channel, message, alert_event)
-                        alert_event.channels_notified.append(channel.get("type", "unknown"))
-                    except Exception as e:
-                        logger.error(f"Failed to send alert to {channel}: {e}")
+                pending.extend((channel, message, alert_event) for channel in rule.channels)
 
                 # Record alert
                 triggered_alerts.append(alert_event)
                 self._alert_history.append(alert_event)
-                self._last_alert_times[rule_name] = now
+                self._state_store.set_last(rule_name, now, rule.cooldown_minutes * 60)
+
+        # Send notifications for all triggered rules together
+        self._dispatch_all(pending)
 
         return triggered_alerts
 
+    def _register_rule(self, rule: AlertRule) -> None:
+        """Add or replace a rule, keeping the threshold indexes sorted."""
+        order = None
+        if rule.name in self._rules:
+            # A replaced rule keeps its place in the check order, like the dict entry
+            order = self._absolute_rules.remove(rule.name)
+            if order is None:
+                order = self._percentage_rules.remove(rule.name)
+        if order is None:
+            order = self._rules_registered
+            self._rules_registered += 1
+
+        if rule.threshold_type == "percentage":
+            self._percentage_rules.insert(rule.threshold, order, rule.name)
+        else:
+            self._absolute_rules.insert(rule.threshold, order, rule.name)
+        self._rules[rule.name] = rule
+
+    def _rules_reached(self, current_cost: float, budget: Optional[float]) -> List[str]:
+        """
+        Names of the rules whose threshold current_cost may have reached, in check order.
+
+        Each index is cut at the first threshold above the cost, so rules that cannot
+        fire are never looked at. Percentage rules are all returned when there is no
+        budget to resolve them against (so each can report it) or when a negative budget
+        reverses their order.
+        """
+        absolute = self._absolute_rules
+        percentage = self._percentage_rules
+        absolute_count = absolute.count_reached(current_cost)
+        if budget is None or budget < 0:
+            percentage_count = len(percentage.names)
+        else:
+            percentage_count = percentage.count_reached(current_cost, budget)
+
+        reached = sorted(
+            chain(
+                zip(absolute.orders[:absolute_count], absolute.names[:absolute_count]),
+                zip(percentage.orders[:percentage_count], percentage.names[:percentage_count]),
+            )
+        )
+        return [name for _, name in reached]
+
     def get_alert_history(self, limit: int = 50) -> List[AlertEvent]:
         """Get recent alert history."""
-        return self._alert_history[-limit:]
+        return list(islice(reversed(self._alert_history), limit))[::-1]
 
     def disable_rule(self, rule_name: str) -> bool:
         """Disable an alert rule."""
@@ -486,6 +831,38 @@ This is an automated alert from Argentum cost monitoring.
             for name, rule in self._rules.items()
         }
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued notifications to be delivered.
+
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Returns:
+            True if every notification queued so far has been sent or has failed
+        """
+        with self._outstanding_lock:
+            outstanding = list(self._outstanding)
+        _, not_done = wait(outstanding, timeout)
+        return not not_done
+
+    def close(self) -> None:
+        """
+        Deliver queued notifications, then close pooled webhook and SMTP connections.
+
+        The alerts stay usable afterwards.
+        """
+        self.flush()
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        with self._smtp_lock:
+            idle = list(chain.from_iterable(self._smtp_pool.values()))
+            self._smtp_pool.clear()
+            self._smtp_idle = 0
+        for connection, _, _ in idle:
+            _quit_smtp(connection)
+
     def _detect_webhook_format(self, url: str) -> str:
         """Detect webhook format from URL."""
         if "slack.com" in url:
@@ -497,6 +874,59 @@ This is an automated alert from Argentum cost monitoring.
         else:
             return "generic"
 
+    def _dispatch_all(self, pending: List[tuple]) -> None:
+        """
+        Queue every (channel, message, alert_event) notification for delivery.
+
+        Notifications for batching channels that share a destination are coalesced into
+        one request. Each request gets a worker of its own, and all of them post through
+        the pooled requests session, so they run concurrently while reusing connections.
+        Returns without waiting.
+        """
+        if not pending:
+            return
+
+        for job in _coalesce_notifications(pending):
+            self._submit(self._deliver, [job])
+
+    def _submit(self, deliver: Callable[[List[tuple]], None], jobs: List[tuple]) -> None:
+        """Run deliver(jobs) on the dispatch pool and track it until it finishes."""
+        future = self._executor.submit(deliver, jobs)
+        with self._outstanding_lock:
+            self._outstanding.add(future)
+        future.add_done_callback(self._delivery_done)
+
+    def _delivery_done(self, future: Future) -> None:
+        with self._outstanding_lock:
+            self._outstanding.discard(future)
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Alert delivery failed: {error}")
+
+    def _deliver(self, jobs: List[tuple]) -> None:
+        """Send (channel, notifications) jobs one after another and record the outcomes."""
+        results = []
+        for channel, notifications in jobs:
+            try:
+                if len(notifications) == 1:
+                    self._send_notification(channel, *notifications[0])
+                else:
+                    self._send_batch(channel, notifications)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        self._record_outcomes(jobs, results)
+
+    @staticmethod
+    def _record_outcomes(jobs: List[tuple], results: List[Optional[BaseException]]) -> None:
+        """Mark delivered channels on their alert events and log failed deliveries."""
+        for (channel, notifications), error in zip(jobs, results):
+            if error is None:
+                for _, alert_event in notifications:
+                    alert_event.channels_notified.append(channel.get("type", "unknown"))
+            else:
+                logger.error(f"Failed to send alert to {channel}: {error}")
+
     def _send_notification(
         self, channel: Dict[str, Any], message: str, alert_event: AlertEvent
     ) -> None:
@@ -512,8 +942,47 @@ This is an automated alert from Argentum cost monitoring.
         else:
             raise ValueError(f"Unknown channel type: {channel_type}")
 
+    def _send_batch(self, channel: Dict[str, Any], notifications: List[tuple]) -> None:
+        """Send several (message, alert_event) notifications to one webhook in one request."""
+        payload = self._batch_payload(channel, notifications)
+        self._post_json(channel["url"], payload)
+
+        # Log successful webhook (but not the URL for security)
+        logger.info(f"Batch of {len(notifications)} alerts sent successfully")
+
+    def _batch_payload(self, channel: Dict[str, Any], notifications: List[tuple]) -> Dict[str, Any]:
+        """Build one JSON body carrying several alerts, in the destination's format."""
+        if channel["type"] == "slack":
+            return self._slack_rich_payload(
+                channel, *(alert_event for _, alert_event in notifications)
+            )
+
+        webhook_format = channel["format"]
+        if webhook_format in ("slack", "teams"):
+            return {"text": "\n\n".join(message for message, _ in notifications)}
+        elif webhook_format == "discord":
+            return {"content": "\n\n".join(message for message, _ in notifications)}
+        else:
+            return {
+                "events": [
+                    self._webhook_payload(channel, message, alert_event)
+                    for message, alert_event in notifications
+                ],
+                "count": len(notifications),
+            }
+
     def _send_webhook(self, channel: Dict[str, Any], message: str, alert_event: AlertEvent) -> None:
         """Send generic webhook notification."""
+        payload = self._webhook_payload(channel, message, alert_event)
+        self._post_json(channel["url"], payload)
+
+        # Log successful webhook (but not the URL for security)
+        logger.info("Webhook alert sent successfully to %s service", channel["format"])
+
+    def _webhook_payload(
+        self, channel: Dict[str, Any], message: str, alert_event: AlertEvent
+    ) -> Dict[str, Any]:
+        """Build the JSON body for a generic webhook in the service's format."""
         webhook_format = channel["format"]
 
         if webhook_format == "slack":
@@ -531,30 +1000,27 @@ This is an automated alert from Argentum cost monitoring.
                     "timestamp": alert_event.triggered_at.isoformat(),
                 },
             }
+        return payload
 
-        # Security controls for HTTP requests
-        if not REQUESTS_AVAILABLE:
-            raise ImportError(
-                "requests library required for webhook alerts. "
-                "Install with: pip install requests"
-            )
-        
-        response = requests.post(
-            channel["url"],
-            json=payload,
-            timeout=10,
-            headers={"User-Agent": "Argentum-Alerts/1.0"},
-            allow_redirects=False,  # Prevent redirect attacks
-        )
-        response.raise_for_status()
+    def _send_slack_rich(self, channel: Dict[str, Any], alert_event: AlertEvent) -> None:
+        """Send rich Slack notification with formatting."""
+        payload = self._slack_rich_payload(channel, alert_event)
+        self._post_json(channel["url"], payload)
 
         # Log successful webhook (but not the URL for security)
-        logger.info(
-            f"Webhook alert sent successfully to {self._detect_webhook_format(channel['url'])} service"
-        )
+        logger.info("Slack alert sent successfully")
 
-    def _send_slack_rich(self, channel: Dict[str, Any], alert_event: AlertEvent) -> None:
-        """Send rich Slack notification with formatting."""
+    def _slack_rich_payload(
+        self, channel: Dict[str, Any], *alert_events: AlertEvent
+    ) -> Dict[str, Any]:
+        """Build the Slack payload with one attachment per alert."""
+        return {
+            **channel["payload_header"],
+            "attachments": [self._slack_attachment(alert_event) for alert_event in alert_events],
+        }
+
+    def _slack_attachment(self, alert_event: AlertEvent) -> Dict[str, Any]:
+        """Build the Slack attachment describing one alert."""
         color = "danger" if alert_event.current_cost > alert_event.budget else "warning"
 
         attachment = {
@@ -569,8 +1035,8 @@ This is an automated alert from Argentum cost monitoring.
                 {"title": "Budget", "value": f"${alert_event.budget:.2f}", "short": True},
                 {
                     "title": "Utilization",
-                    "value": f"{(alert_event.current_cost / alert_event.budget * 100):.1f}%"
-                    if alert_event.budget > 0
+                    "value": f"{alert_event.utilization:.1%}"
+                    if alert_event.utilization is not None
                     else "N/A",
                     "short": True,
                 },
@@ -584,65 +1050,149 @@ This is an automated alert from Argentum cost monitoring.
             "ts": int(alert_event.triggered_at.timestamp()),
         }
 
-        payload = {
-            "username": channel.get("username", "Argentum"),
-            "icon_emoji": channel.get("icon_emoji", ":money_with_wings:"),
-            "attachments": [attachment],
-        }
+        return attachment
 
-        if channel.get("channel"):
-            payload["channel"] = channel["channel"]
+    def _post_json(self, url: str, payload: Dict[str, Any]) -> None:
+        """POST a JSON payload to a webhook and raise on an error response."""
+        response = self._http_session().post(
+            url,
+            data=_dumps(payload),
+            timeout=_WEBHOOK_TIMEOUT_SECONDS,
+            headers=_WEBHOOK_HEADERS,
+            allow_redirects=False,  # Prevent redirect attacks
+        )
+        response.raise_for_status()
 
+    def _http_session(self) -> "requests.Session":
+        """Return the pooled session, so repeated alerts to a host reuse its TLS connection."""
         # Security controls for HTTP requests
         if not REQUESTS_AVAILABLE:
             raise ImportError(
                 "requests library required for webhook alerts. "
                 "Install with: pip install requests"
             )
-        
-        response = requests.post(
-            channel["url"],
-            json=payload,
-            timeout=10,
-            headers={"User-Agent": "Argentum-Alerts/1.0"},
-            allow_redirects=False,  # Prevent redirect attacks
-        )
-        response.raise_for_status()
 
-        # Log successful webhook (but not the URL for security)
-        logger.info(f"Slack alert sent successfully")
+        if self._http is not None:
+            return self._http
+
+        with self._http_lock:
+            if self._http is not None:
+                return self._http
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # urllib3 leaves POST out of its retryable methods, so only failed
+            # connections are retried; a POST that reached the server is never resent,
+            # since that could deliver the same alert twice
+            adapter = HTTPAdapter(
+                pool_connections=_HTTP_POOL_CONNECTIONS,
+                pool_maxsize=_HTTP_POOL_MAXSIZE,
+                max_retries=Retry(
+                    total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+                ),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            self._http = session
+            return session
 
     def _send_email(self, channel: Dict[str, Any], message: str, alert_event: AlertEvent) -> None:
         """Send email notification."""
+        from email.message import EmailMessage
+
         smtp_config = channel["smtp_config"]
 
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg["From"] = smtp_config.get("from_email", "alerts@argentum.ai")
         msg["To"] = channel["email"]
         msg["Subject"] = channel["subject"]
 
-        # Create HTML body
-        html_body = f"""
-        <html>
-          <body>
-            <h2>🚨 Argentum Cost Alert</h2>
-            <p><strong>Current Cost:</strong> ${alert_event.current_cost:.2f}</p>
-            <p><strong>Budget:</strong> ${alert_event.budget:.2f}</p>
-            <p><strong>Threshold:</strong> ${alert_event.threshold_value:.2f}</p>
-            <p><strong>Time:</strong> {alert_event.triggered_at.strftime("%Y-%m-%d %H:%M:%S")}</p>
-            <hr>
-            <p style="color: #666;">This is an automated alert from Argentum cost monitoring.</p>
-          </body>
-        </html>
-        """
+        # Plain text with an HTML alternative
+        msg.set_content(message)
+        msg.add_alternative(
+            _EMAIL_HTML_TEMPLATE.substitute(
+                cost=f"{alert_event.current_cost:.2f}",
+                budget=f"{alert_event.budget:.2f}",
+                threshold=f"{alert_event.threshold_value:.2f}",
+                time=alert_event.triggered_at.strftime("%Y-%m-%d %H:%M:%S"),
+            ),
+            subtype="html",
+        )
 
-        msg.attach(MIMEText(message, "plain"))
-        msg.attach(MIMEText(html_body, "html"))
+        key = _smtp_key(smtp_config)
+        entry = self._checkout_smtp(key, smtp_config)
+        try:
+            entry[0].send_message(msg)
+        except BaseException:
+            _quit_smtp(entry[0])
+            raise
+        entry[1] -= 1
+        self._checkin_smtp(key, entry)
 
-        # Send email (implementation depends on SMTP configuration)
-        # Note: In production, this would use proper SMTP configuration
         logger.info(f"Email alert sent to {channel['email']}: {message[:100]}...")
 
+    def _checkout_smtp(self, key: Tuple[str, int, str], smtp_config: Dict[str, Any]) -> list:
+        """
+        Take an idle [connection, messages left, opened at] entry for a server, or open one.
+
+        self._smtp_lock is only held to take the entry out of the pool. The NOOP check and
+        any connect, STARTTLS and login run without it, so a slow server never holds up
+        email to the others. Concurrent sends to one server each get their own connection.
+        """
+        import smtplib
+
+        entry = None
+        with self._smtp_lock:
+            idle = self._smtp_pool.get(key)
+            if idle:
+                entry = idle.pop()
+                self._smtp_idle -= 1
+                if not idle:
+                    del self._smtp_pool[key]
+
+        if entry is not None:
+            connection, _, opened_at = entry
+            if time.monotonic() - opened_at > _SMTP_CONNECTION_TTL_SECONDS:
+                alive = False
+            else:
+                try:
+                    alive = connection.noop()[0] == 250
+                except (smtplib.SMTPException, OSError):
+                    alive = False
+            if alive:
+                return entry
+            _quit_smtp(connection)
+
+        return [_open_smtp(smtp_config), _SMTP_MESSAGES_PER_CONNECTION, time.monotonic()]
+
+    def _checkin_smtp(self, key: Tuple[str, int, str], entry: list) -> None:
+        """
+        Return a checked-out entry to the pool once its message has been sent.
+
+        Connections that used up their messages are closed, as are the least recently
+        used server's idle connections once more than _SMTP_POOL_SIZE are kept.
+        """
+        surplus = []
+        if entry[1] <= 0:
+            surplus.append(entry[0])
+        else:
+            with self._smtp_lock:
+                pool = self._smtp_pool
+                pool.setdefault(key, []).append(entry)
+                pool.move_to_end(key)
+                self._smtp_idle += 1
+                while self._smtp_idle > _SMTP_POOL_SIZE:
+                    oldest = next(iter(pool))
+                    idle = pool[oldest]
+                    surplus.append(idle.pop(0)[0])
+                    self._smtp_idle -= 1
+                    if not idle:
+                        del pool[oldest]
+
+        for connection in surplus:
+            _quit_smtp(connection)
+
     def _get_default_smtp_config(self) -> Dict[str, Any]:
         """Get default SMTP configuration."""
         return {
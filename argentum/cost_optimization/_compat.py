@@ -0,0 +1,8 @@
+"""
+Python version compatibility helpers for the cost optimization package.
+"""
+import sys
+
+# ``@dataclass(slots=True)`` is only accepted from Python 3.10; on older interpreters
+# the affected dataclasses fall back to a regular instance ``__dict__``.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
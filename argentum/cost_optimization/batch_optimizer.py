@@ -1,11 +1,19 @@
 """
 Request batching optimizer.
 """
+import logging
 import threading
+import time
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ._compat import DATACLASS_SLOTS
+
+logger = logging.getLogger(__name__)
 
 
 class BatchStrategy(Enum):
@@ -14,15 +22,17 @@ class BatchStrategy(Enum):
     HYBRID = "hybrid"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BatchRequest:
     request_id: str
     prompt: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Monotonic clock reading for timeout math, which must not follow wall-clock changes
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Batch:
     batch_id: str
     requests: List[BatchRequest]
@@ -43,17 +53,38 @@ class BatchOptimizer:
         self.timeout_seconds = timeout_seconds
         self.strategy = strategy
         self.on_batch_ready = on_batch_ready
-        self._pending_requests: List[BatchRequest] = []
+        # Producers only append, which deque does atomically; everything that removes
+        # requests holds _lock, so a flush never races another flush
+        self._pending_requests: Deque[BatchRequest] = deque()
         self._lock = threading.Lock()
         self._batch_counter = 0
-        self._last_batch_time = datetime.utcnow()
+        self._last_batch_ns = time.monotonic_ns()
+
+        # Time-based strategies flush partial batches from a background thread, which
+        # can only hand them to on_batch_ready; without a callback, poll get_batch(force=True)
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if on_batch_ready is not None and strategy is not BatchStrategy.SIZE_BASED:
+            # The thread only holds a weak reference, so an optimizer that is dropped
+            # without shutdown() is still collected, and collecting it stops the thread
+            self._flusher = threading.Thread(
+                target=_run_flusher,
+                args=(weakref.ref(self), self._stop_flusher, timeout_seconds),
+                name="BatchOptimizer-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+            weakref.finalize(self, self._stop_flusher.set)
 
     def add_request(
         self, request_id: str, prompt: str, metadata: Optional[Dict] = None
     ) -> Optional[Batch]:
         request = BatchRequest(request_id=request_id, prompt=prompt, metadata=metadata or {})
+        self._pending_requests.append(request)
+        if len(self._pending_requests) < self.max_batch_size:
+            return None
         with self._lock:
-            self._pending_requests.append(request)
+            # Another producer may have taken the full batch in the meantime
             return self._check_batch_ready()
 
     def get_batch(self, force: bool = False) -> Optional[Batch]:
@@ -62,6 +93,32 @@ class BatchOptimizer:
                 return self._create_batch()
             return self._check_batch_ready()
 
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the background flusher; pending requests stay queued for get_batch."""
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout)
+            self._flusher = None
+
+    def _flush_due(self) -> float:
+        """
+        Flush pending requests if timeout_seconds have passed since the last batch.
+
+        Returns the seconds until the next flush is due.
+        """
+        with self._lock:
+            elapsed = (time.monotonic_ns() - self._last_batch_ns) / 1e9
+            if elapsed < self.timeout_seconds:
+                # A batch went out recently; sleep until its window closes
+                return self.timeout_seconds - elapsed
+            while self._pending_requests:
+                batch = self._create_batch()
+                try:
+                    self.on_batch_ready(batch)
+                except Exception:
+                    logger.exception("on_batch_ready failed for %s", batch.batch_id)
+            return self.timeout_seconds
+
     def _check_batch_ready(self) -> Optional[Batch]:
         if not self._pending_requests:
             return None
@@ -74,8 +131,8 @@ class BatchOptimizer:
 
     def _create_batch(self) -> Batch:
         self._batch_counter += 1
-        batch_requests = self._pending_requests[: self.max_batch_size]
-        self._pending_requests = self._pending_requests[self.max_batch_size :]
+        pending = self._pending_requests
+        batch_requests = [pending.popleft() for _ in range(min(self.max_batch_size, len(pending)))]
         batch = Batch(
             f"batch_{self._batch_counter}",
             batch_requests,
@@ -83,5 +140,17 @@ class BatchOptimizer:
             self.max_batch_size,
             self.timeout_seconds,
         )
-        self._last_batch_time = datetime.utcnow()
+        self._last_batch_ns = time.monotonic_ns()
         return batch
+
+
+def _run_flusher(
+    optimizer_ref: "weakref.ref[BatchOptimizer]", stop: threading.Event, wait: float
+) -> None:
+    """Background flusher loop; the optimizer is only strongly referenced while flushing."""
+    while not stop.wait(wait):
+        optimizer = optimizer_ref()
+        if optimizer is None:
+            return
+        wait = optimizer._flush_due()
+        del optimizer
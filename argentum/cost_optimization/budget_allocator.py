@@ -1,7 +1,9 @@
 """
 Budget allocation across agents and tasks.
 """
+import heapq
 import threading
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -9,6 +11,25 @@ from typing import Dict, List, Optional
 
 from .token_budget import TokenBudgetManager
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Below this many agents the plain Python loop is faster than NumPy's per-call overhead.
+_VECTORIZE_MIN_AGENTS = 256
+
+# record_usage only locks one of _USAGE_LOCK_STRIPES locks, chosen by agent id, so usage
+# for agents on different stripes is recorded concurrently
+_USAGE_LOCK_STRIPES = 16  # power of two, so an agent's stripe is hash(id) & (stripes - 1)
+
+# DYNAMIC allocation weights each agent by priority + age * _AGING_STEP, where age counts
+# the consecutive rounds, up to _MAX_AGE, in which it used its whole allocation
+_AGING_STEP = 1.0
+_MAX_AGE = 4
+
 
 class AllocationStrategy(Enum):
     EQUAL = "equal"
@@ -47,16 +68,35 @@ class BudgetAllocator:
         self.strategy = strategy
         self.reserve_percentage = reserve_percentage
         self._agents: Dict[str, Dict] = {}
+        # Each agent's priority in registration order (the order of self._agents), kept
+        # as a column so priority-based allocation can divide the budget with NumPy
+        self._priorities = array("d")
+        self._priority_rows: Dict[str, int] = {}
         self._allocations: Dict[str, int] = {}
         self._usage: Dict[str, int] = {}
+        # Fractional tokens each agent is owed (or, when negative, ahead by) under the
+        # FAIR_SHARE and DYNAMIC strategies, carried from one allocate() to the next
+        self._deficits: Dict[str, float] = {}
+        # DYNAMIC strategy state: each agent's age and its usage when the round started
+        self._ages: Dict[str, int] = {}
+        self._round_start_usage: Dict[str, int] = {}
         self._lock = threading.Lock()
+        # Lock order: a stripe may be taken while holding _lock, never the reverse
+        self._usage_locks = [threading.Lock() for _ in range(_USAGE_LOCK_STRIPES)]
 
     def register_agent(
         self, agent_id: str, priority: int = 1, initial_budget: Optional[int] = None
     ):
         with self._lock:
             self._agents[agent_id] = {"priority": priority, "registered_at": datetime.utcnow()}
-            self._usage[agent_id] = 0
+            row = self._priority_rows.get(agent_id)
+            if row is None:
+                self._priority_rows[agent_id] = len(self._priorities)
+                self._priorities.append(priority)
+            else:
+                self._priorities[row] = priority
+            with self._usage_lock(agent_id):
+                self._usage[agent_id] = 0
             if initial_budget:
                 self._allocations[agent_id] = initial_budget
 
@@ -67,6 +107,10 @@ class BudgetAllocator:
                 allocations = self._equal_allocation(available_budget)
             elif self.strategy == AllocationStrategy.PRIORITY_BASED:
                 allocations = self._priority_based_allocation(available_budget)
+            elif self.strategy == AllocationStrategy.FAIR_SHARE:
+                allocations = self._fair_share_allocation(available_budget)
+            elif self.strategy == AllocationStrategy.DYNAMIC:
+                allocations = self._dynamic_allocation(available_budget)
             else:
                 allocations = self._equal_allocation(available_budget)
             self._allocations = allocations
@@ -81,10 +125,11 @@ class BudgetAllocator:
             return AllocationPlan(self.total_budget, agent_allocations, self.strategy)
 
     def record_usage(self, agent_id: str, tokens: int):
-        with self._lock:
-            if agent_id not in self._usage:
-                self._usage[agent_id] = 0
-            self._usage[agent_id] += tokens
+        with self._usage_lock(agent_id):
+            self._usage[agent_id] = self._usage.get(agent_id, 0) + tokens
+
+    def _usage_lock(self, agent_id: str) -> threading.Lock:
+        return self._usage_locks[hash(agent_id) & (_USAGE_LOCK_STRIPES - 1)]
 
     def get_agent_budget(self, agent_id: str) -> Optional[int]:
         with self._lock:
@@ -95,15 +140,76 @@ class BudgetAllocator:
         if agent_count == 0:
             return {}
         per_agent = available_budget // agent_count
-        return {agent_id: per_agent for agent_id in self._agents.keys()}
+        return dict.fromkeys(self._agents, per_agent)
 
     def _priority_based_allocation(self, available_budget: int) -> Dict[str, int]:
         if not self._agents:
             return {}
+        if NUMPY_AVAILABLE and len(self._agents) >= _VECTORIZE_MIN_AGENTS:
+            priorities = np.frombuffer(self._priorities, dtype=np.float64)
+            total_priority = priorities.sum()
+            if total_priority <= 0:
+                return self._equal_allocation(available_budget)
+            # The loop's arithmetic, done for every agent at once and truncated like int()
+            shares = (available_budget * (priorities / total_priority)).astype(np.int64)
+            return dict(zip(self._agents, shares.tolist()))
         total_priority = sum(agent_info.get("priority", 1) for agent_info in self._agents.values())
+        if total_priority <= 0:
+            return self._equal_allocation(available_budget)
         allocations = {}
         for agent_id, agent_info in self._agents.items():
             priority = agent_info.get("priority", 1)
             allocation = int(available_budget * (priority / total_priority))
             allocations[agent_id] = allocation
         return allocations
+
+    def _fair_share_allocation(self, available_budget: int) -> Dict[str, int]:
+        weights = {
+            agent_id: agent_info.get("priority", 1) for agent_id, agent_info in self._agents.items()
+        }
+        return self._deficit_allocation(available_budget, weights)
+
+    def _dynamic_allocation(self, available_budget: int) -> Dict[str, int]:
+        weights = {}
+        for agent_id, agent_info in self._agents.items():
+            usage = self._usage.get(agent_id, 0)
+            used = usage - self._round_start_usage.get(agent_id, 0)
+            allocated = self._allocations.get(agent_id)
+            # An agent whose usage stayed within its allocation was served; one that used it
+            # all ages, so its weight grows until its demand is met
+            if allocated is not None and used >= allocated:
+                age = min(self._ages.get(agent_id, 0) + 1, _MAX_AGE)
+            else:
+                age = 0
+            self._ages[agent_id] = age
+            self._round_start_usage[agent_id] = usage
+            weights[agent_id] = agent_info.get("priority", 1) + age * _AGING_STEP
+        return self._deficit_allocation(available_budget, weights)
+
+    def _deficit_allocation(
+        self, available_budget: int, weights: Dict[str, float]
+    ) -> Dict[str, int]:
+        """
+        Weighted deficit round robin over whole tokens.
+
+        Each agent gets the whole part of its weighted share and adds the fraction to its
+        deficit. The tokens those fractions add up to go one each to the agents with the
+        largest deficits, which then drop by one, so every token of available_budget is
+        handed out and over successive rounds each agent receives its exact share.
+        """
+        total_weight = sum(weights.values())
+        if total_weight <= 0:
+            return self._equal_allocation(available_budget)
+        quantum = available_budget / total_weight
+        deficits = self._deficits
+        allocations = {}
+        for agent_id, weight in weights.items():
+            share = weight * quantum
+            whole = int(share)
+            allocations[agent_id] = whole
+            deficits[agent_id] = deficits.get(agent_id, 0.0) + share - whole
+        leftover = available_budget - sum(allocations.values())
+        for agent_id in heapq.nlargest(leftover, allocations, key=deficits.__getitem__):
+            allocations[agent_id] += 1
+            deficits[agent_id] -= 1.0
+        return allocations
@@ -2,11 +2,34 @@
 Intelligent caching layer for AI agent responses.
 """
 import hashlib
+import itertools
+import math
+import operator
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import hnswlib
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# The cache is split across _SHARD_COUNT independently locked shards, so lookups of
+# different keys rarely wait on each other. max_size is divided between the shards and
+# each evicts on its own.
+_SHARD_COUNT = 16  # power of two, so a key's shard is fingerprint & (_SHARD_COUNT - 1)
 
 
 class CacheHit:
@@ -40,60 +63,230 @@ class CacheStats:
     cost_saved: float = 0.0
 
 
+class _Shard:
+    """One lock-striped slice of the cache, with its own counters."""
+
+    def __init__(self):
+        # key fingerprint -> (value, expiration, created_at, key), least recently used
+        # first. The key is kept so a hit can tell a fingerprint collision from a match.
+        self.cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+        # Hits are counted without the lock: next() on itertools.count is atomic. It can
+        # only be read by advancing it too, so hit_count() subtracts its own earlier reads.
+        self.hits = itertools.count()
+        self.hit_reads = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hit_count(self) -> int:
+        """Hits so far; call with the lock held."""
+        count = next(self.hits) - self.hit_reads
+        self.hit_reads += 1
+        return count
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else [0.0] * len(vector)
+
+
+class _SemanticIndex:
+    """
+    Nearest-neighbour index over the embeddings of cached keys.
+
+    With hnswlib installed this is an HNSW graph, so a lookup takes roughly logarithmic
+    time; without it every stored embedding is compared, which is exact but linear.
+    Entries get a fresh label on each insert so that hnswlib can reuse the slots of
+    deleted ones.
+    """
+
+    def __init__(self, max_elements: int):
+        self.max_elements = max_elements
+        self._labels: Dict[int, int] = {}  # fingerprint -> label
+        self._fingerprints: Dict[int, int] = {}  # label -> fingerprint
+        self._next_label = itertools.count()
+        self._index = None  # hnswlib index, built on the first insert once dim is known
+        self._vectors: Dict[int, List[float]] = {}  # label -> unit vector, without hnswlib
+
+    def insert(self, fingerprint: int, embedding: Sequence[float]) -> None:
+        self.remove(fingerprint)
+        label = next(self._next_label)
+        if HNSWLIB_AVAILABLE:
+            if self._index is None:
+                self._index = hnswlib.Index(space="cosine", dim=len(embedding))
+                self._index.init_index(
+                    max_elements=self.max_elements,
+                    ef_construction=200,
+                    M=16,
+                    allow_replace_deleted=True,
+                )
+            self._index.add_items([embedding], [label], replace_deleted=True)
+        else:
+            self._vectors[label] = _unit(embedding)
+        self._labels[fingerprint] = label
+        self._fingerprints[label] = fingerprint
+
+    def remove(self, fingerprint: int) -> None:
+        label = self._labels.pop(fingerprint, None)
+        if label is None:
+            return
+        del self._fingerprints[label]
+        if self._index is not None:
+            self._index.mark_deleted(label)
+        else:
+            del self._vectors[label]
+
+    def nearest(self, embedding: Sequence[float]) -> Optional[Tuple[int, float]]:
+        """(fingerprint, cosine similarity) of the closest stored key, or None if empty."""
+        if not self._fingerprints:
+            return None
+        if self._index is not None:
+            labels, distances = self._index.knn_query([embedding], k=1)
+            label = int(labels[0][0])
+            similarity = 1.0 - float(distances[0][0])
+        else:
+            query = _unit(embedding)
+            similarity, label = max(
+                (sum(map(operator.mul, query, vector)), label)
+                for label, vector in self._vectors.items()
+            )
+        return self._fingerprints[label], similarity
+
+
 class CacheLayer:
-    def __init__(self, config: Optional[CacheConfig] = None):
+    def __init__(
+        self,
+        config: Optional[CacheConfig] = None,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None,
+    ):
         self.config = config or CacheConfig()
-        self._cache: Dict[str, tuple] = {}
-        self._lock = threading.Lock()
-        self._stats = CacheStats()
+        self._shards = [_Shard() for _ in range(_SHARD_COUNT)]
+        self._shard_max_size = max(1, -(-self.config.max_size // _SHARD_COUNT))
+        # Misses fall back to the most similar cached key when an embedder is given
+        self._embedder = embedder
+        self._semantic = None
+        if embedder is not None and self.config.enable_semantic_cache:
+            self._semantic = _SemanticIndex(self._shard_max_size * _SHARD_COUNT)
+        # Lock order: a shard lock may be held while taking _semantic_lock, never the reverse
+        self._semantic_lock = threading.Lock()
 
     def get(self, key: str):
         cache_key = self._normalize_key(key)
-        with self._lock:
-            self._stats.total_requests += 1
-            if cache_key in self._cache:
-                value, expiration = self._cache[cache_key]
-                if time.time() < expiration:
-                    self._stats.hits += 1
-                    self._update_hit_rate()
-                    age = time.time() - (expiration - self.config.ttl_seconds)
-                    return CacheHit(cache_key, value, age)
-                else:
-                    del self._cache[cache_key]
-            self._stats.misses += 1
-            self._update_hit_rate()
-            return CacheMiss(cache_key)
+        fingerprint = self._fingerprint(cache_key)
+        shard = self._shard(fingerprint)
+        # Hits skip the lock: dict lookups and OrderedDict.move_to_end are atomic under
+        # the GIL, so only misses and expiry take it for their bookkeeping
+        entry = shard.cache.get(fingerprint)
+        if entry is not None and entry[3] != cache_key:
+            entry = None  # Another key with the same fingerprint; not ours to expire
+        if entry is not None:
+            value, expiration, created_at, _ = entry
+            now = time.time()
+            if now < expiration:
+                try:
+                    shard.cache.move_to_end(fingerprint)
+                except KeyError:
+                    pass  # Evicted by a concurrent set; the value read is still valid
+                next(shard.hits)
+                age = now - created_at
+                return CacheHit(cache_key, value, age)
+        with shard.lock:
+            # Only drop the expired entry if a concurrent set has not replaced it
+            if entry is not None and shard.cache.get(fingerprint) is entry:
+                self._evict(shard, fingerprint)
+            if self._semantic is None:
+                shard.misses += 1
+                return CacheMiss(cache_key)
+        return self._get_semantic(cache_key, shard)
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
         cache_key = self._normalize_key(key)
+        fingerprint = self._fingerprint(cache_key)
+        embedding = self._embedder(cache_key) if self._semantic is not None else None
         ttl = ttl_seconds or self.config.ttl_seconds
-        expiration = time.time() + ttl
-        with self._lock:
-            if len(self._cache) >= self.config.max_size and cache_key not in self._cache:
-                oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k][1])
-                del self._cache[oldest_key]
-                self._stats.evictions += 1
-            self._cache[cache_key] = (value, expiration)
-            self._stats.size = len(self._cache)
+        now = time.time()
+        shard = self._shard(fingerprint)
+        with shard.lock:
+            cache = shard.cache
+            if fingerprint in cache:
+                cache.move_to_end(fingerprint)
+            elif len(cache) >= self._shard_max_size:
+                # popitem is atomic, unlike iterating the cache to find the oldest key,
+                # so it cannot trip over a lock-free move_to_end from get()
+                evicted, _ = cache.popitem(last=False)
+                self._forget(evicted)
+                shard.evictions += 1
+            cache[fingerprint] = (value, now + ttl, now, cache_key)
+            if embedding is not None:
+                with self._semantic_lock:
+                    self._semantic.insert(fingerprint, embedding)
 
     def get_stats(self) -> CacheStats:
-        with self._lock:
-            self._stats.cost_saved = self._stats.hits * 0.01
-            return CacheStats(
-                hits=self._stats.hits,
-                misses=self._stats.misses,
-                total_requests=self._stats.total_requests,
-                hit_rate=self._stats.hit_rate,
-                size=self._stats.size,
-                evictions=self._stats.evictions,
-                cost_saved=self._stats.cost_saved,
-            )
+        stats = CacheStats()
+        for shard in self._shards:
+            with shard.lock:
+                stats.hits += shard.hit_count()
+                stats.misses += shard.misses
+                stats.evictions += shard.evictions
+                stats.size += len(shard.cache)
+        stats.total_requests = stats.hits + stats.misses
+        if stats.total_requests > 0:
+            stats.hit_rate = stats.hits / stats.total_requests
+        stats.cost_saved = stats.hits * 0.01
+        return stats
+
+    def _get_semantic(self, cache_key: str, shard: _Shard):
+        """Look up the cached key most similar to cache_key after an exact miss."""
+        embedding = self._embedder(cache_key)
+        with self._semantic_lock:
+            nearest = self._semantic.nearest(embedding)
+        if nearest is not None:
+            fingerprint, similarity = nearest
+            if similarity >= self.config.semantic_threshold:
+                match_shard = self._shard(fingerprint)
+                entry = match_shard.cache.get(fingerprint)
+                now = time.time()
+                # An expired match is left for its own key's lookup or eviction to drop
+                if entry is not None and now < entry[1]:
+                    next(match_shard.hits)
+                    return CacheHit(cache_key, entry[0], now - entry[2])
+        with shard.lock:
+            shard.misses += 1
+        return CacheMiss(cache_key)
+
+    def _evict(self, shard: _Shard, fingerprint: int) -> None:
+        """Drop an entry and its embedding; call with the shard lock held."""
+        del shard.cache[fingerprint]
+        self._forget(fingerprint)
+
+    def _forget(self, fingerprint: int) -> None:
+        """Drop an entry's embedding from the semantic index, if there is one."""
+        if self._semantic is not None:
+            with self._semantic_lock:
+                self._semantic.remove(fingerprint)
+
+    def _shard(self, fingerprint: int) -> _Shard:
+        return self._shards[fingerprint & (_SHARD_COUNT - 1)]
 
     def _normalize_key(self, key: str) -> str:
-        return " ".join(key.strip().split())
+        # Every whitespace character but the ASCII space is unprintable, so a printable key
+        # with no doubled, leading or trailing spaces is already normalized
+        if key.isprintable() and "  " not in key and key[:1] != " " and key[-1:] != " ":
+            return key
+        return " ".join(key.split())
 
-    def _update_hit_rate(self):
-        if self._stats.total_requests > 0:
-            self._stats.hit_rate = self._stats.hits / self._stats.total_requests
-        else:
-            self._stats.hit_rate = 0.0
+    @staticmethod
+    def _fingerprint(cache_key: str) -> int:
+        """
+        64-bit hash of a normalized key, which the shards' dicts are keyed on.
+
+        Entries also keep the key itself, and a hit compares it, so two keys with the
+        same fingerprint never get each other's value.
+
+        Without xxhash this is the built-in string hash, which the str caches, so a key
+        object that is looked up repeatedly is only hashed once. Entries never outlive
+        the process, so its per-process seed does not matter.
+        """
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(cache_key.encode())
+        return hash(cache_key)
@@ -1,10 +1,13 @@
 """
 Context optimization for reducing token usage.
 """
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from ._compat import DATACLASS_SLOTS
 from .token_counter import TokenCounter, TokenizerType, TokenUsage
 
 
@@ -14,7 +17,7 @@ class OptimizationStrategy(Enum):
     CONSERVATIVE = "conservative"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class OptimizationResult:
     original_tokens: int
     optimized_tokens: int
@@ -25,6 +28,38 @@ class OptimizationResult:
     quality_score: float = 1.0
 
 
+_TOKEN_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[Tuple[TokenizerType, str], int]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _count_tokens_cached(counter: TokenCounter, texts: List[str]) -> List[int]:
+    """Token counts for texts via a shared LRU; misses are counted in one batch call."""
+    tokenizer_type = counter.tokenizer_type
+    counts = []
+    missing: Dict[str, List[int]] = {}
+    with _token_cache_lock:
+        for i, text in enumerate(texts):
+            key = (tokenizer_type, text)
+            cached = _token_cache.get(key)
+            if cached is None:
+                missing.setdefault(text, []).append(i)
+                counts.append(0)
+            else:
+                _token_cache.move_to_end(key)
+                counts.append(cached)
+    if missing:
+        fresh = counter.count_batch(list(missing))
+        with _token_cache_lock:
+            for (text, positions), item_tokens in zip(missing.items(), fresh):
+                for i in positions:
+                    counts[i] = item_tokens
+                _token_cache[(tokenizer_type, text)] = item_tokens
+            while len(_token_cache) > _TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return counts
+
+
 class ContextOptimizer:
     def __init__(
         self,
@@ -38,38 +73,47 @@ class ContextOptimizer:
         self.min_importance = min_importance
         self.token_counter = TokenCounter(tokenizer_type)
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        with _token_cache_lock:
+            _token_cache.clear()
+
     def optimize(
         self, context_items: List[Tuple[str, Any, float]]
     ) -> Tuple[List[Tuple[str, Any, float]], OptimizationResult]:
         if not context_items:
             return [], OptimizationResult(0, 0, 0.0, 0, 0, self.strategy, 1.0)
-        original_tokens = sum(
-            self.token_counter.count(str(k) + str(v)).total_tokens for k, v, _ in context_items
-        )
-        filtered = [(k, v, imp) for k, v, imp in context_items if imp >= self.min_importance]
-        filtered.sort(key=lambda x: x[2], reverse=True)
+        enriched = []
+        original_tokens = 0
+        total_importance = 0.0
+        counts = _count_tokens_cached(self.token_counter, [f"{k}{v}" for k, v, _ in context_items])
+        for (k, v, imp), item_tokens in zip(context_items, counts):
+            original_tokens += item_tokens
+            total_importance += imp
+            if imp >= self.min_importance:
+                enriched.append((k, v, imp, item_tokens))
+        enriched.sort(key=lambda x: x[2], reverse=True)
         optimized = []
-        current_tokens = 0
-        for k, v, imp in filtered:
-            item_tokens = self.token_counter.count(str(k) + str(v)).total_tokens
-            if current_tokens + item_tokens <= self.max_tokens:
+        optimized_tokens = 0
+        kept_importance = 0.0
+        # Keep going past items that don't fit: smaller, less important ones may still
+        # fit. Stop once not even the smallest item could.
+        remaining = self.max_tokens
+        smallest = min((t for _, _, _, t in enriched), default=0)
+        for k, v, imp, item_tokens in enriched:
+            if item_tokens <= remaining:
                 optimized.append((k, v, imp))
-                current_tokens += item_tokens
-            else:
-                break
-        optimized_tokens = sum(
-            self.token_counter.count(str(k) + str(v)).total_tokens for k, v, _ in optimized
-        )
+                optimized_tokens += item_tokens
+                kept_importance += imp
+                remaining -= item_tokens
+                if remaining < smallest:
+                    break
         reduction = (
             ((original_tokens - optimized_tokens) / original_tokens * 100)
             if original_tokens > 0
             else 0.0
         )
-        quality = (
-            sum(imp for _, _, imp in optimized) / sum(imp for _, _, imp in context_items)
-            if context_items
-            else 1.0
-        )
+        quality = kept_importance / total_importance if total_importance > 0 else 1.0
         return optimized, OptimizationResult(
             original_tokens,
             optimized_tokens,
@@ -1,6 +1,7 @@
 """
 Context pruning for aggressive token reduction.
 """
+import heapq
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, List, Optional, Tuple
@@ -43,15 +44,23 @@ class ContextPruner:
         if not context_items:
             return [], PruningResult(0, 0, 0, 0, self.strategy)
         original_count = len(context_items)
-        original_tokens = sum(
+        # Each item is tokenized once; the kept items' counts are looked up by position
+        token_counts = [
             self.token_counter.count(str(k) + str(v)).total_tokens for k, v, _ in context_items
+        ]
+        original_tokens = sum(token_counts)
+        # nlargest keeps the top max_items without sorting the rest; ties keep input order
+        kept = heapq.nlargest(
+            self.max_items,
+            (
+                (i, (k, v, imp))
+                for i, (k, v, imp) in enumerate(context_items)
+                if imp >= self.min_importance
+            ),
+            key=lambda x: x[1][2],
         )
-        filtered = [(k, v, imp) for k, v, imp in context_items if imp >= self.min_importance]
-        filtered.sort(key=lambda x: x[2], reverse=True)
-        pruned = filtered[: self.max_items]
-        pruned_tokens = sum(
-            self.token_counter.count(str(k) + str(v)).total_tokens for k, v, _ in pruned
-        )
+        pruned = [item for _, item in kept]
+        pruned_tokens = sum(token_counts[i] for i, _ in kept)
         tokens_saved = original_tokens - pruned_tokens
         return pruned, PruningResult(
             original_count, len(pruned), tokens_saved, original_count - len(pruned), self.strategy
@@ -1,14 +1,39 @@
 """
 Cost tracking and attribution for AI agent operations.
 """
+import bisect
+import json
 import threading
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 
 from .token_counter import TokenizerType, TokenUsage, estimate_cost
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_HOUR = timedelta(hours=1)
+_HOUR_US = 3_600_000_000
+
+# Below this many events in a period the plain Python report loop is faster than NumPy.
+_VECTORIZE_MIN_EVENTS = 256
+
 
 @dataclass
 class CostBreakdown:
@@ -52,6 +77,87 @@ class CostReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+# Model name -> tokenizer type, filled in as record_usage meets each model
+_MODEL_TOKENIZERS: Dict[str, TokenizerType] = {}
+
+
+def _tokenizer_for_model(model: str) -> TokenizerType:
+    model = model.lower()
+    if model.startswith("gpt-4"):
+        return TokenizerType.OPENAI_GPT4
+    elif model.startswith("gpt-3.5") or "turbo" in model:
+        return TokenizerType.OPENAI_GPT35
+    elif "claude" in model:
+        return TokenizerType.ANTHROPIC_CLAUDE
+    return TokenizerType.APPROXIMATE
+
+
+_EXPORT_FIELDS = (
+    "timestamp",
+    "agent_id",
+    "operation",
+    "model",
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "cost",
+    "metadata",
+)
+
+
+def _event_row(e: CostEvent) -> Dict[str, Any]:
+    """One event as an export_events row, with fields in _EXPORT_FIELDS order."""
+    return {
+        "timestamp": e.timestamp.isoformat(),
+        "agent_id": e.agent_id,
+        "operation": e.operation,
+        "model": e.model,
+        "input_tokens": e.token_usage.input_tokens,
+        "output_tokens": e.token_usage.output_tokens,
+        "total_tokens": e.token_usage.total_tokens,
+        "cost": e.cost,
+        "metadata": e.metadata,
+    }
+
+
+def _row_to_json(row: Dict[str, Any]) -> str:
+    """One export row as JSON indented by two spaces, encoded with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(row, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # orjson rejects some values json accepts, such as integers over 64 bits
+    return json.dumps(row, indent=2)
+
+
+def _hour_label(hour: int) -> str:
+    """ISO timestamp of the start of the given hour since the epoch, the by-time report key."""
+    return (_EPOCH + timedelta(hours=hour)).isoformat()
+
+
+def _code(codes: Dict[str, int], name: str) -> int:
+    """Code for name in codes, assigning the next one if it is new."""
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(codes)
+    return code
+
+
+def _sum_by_code(
+    column: array, codes: Dict[str, int], rows: Any, costs: "np.ndarray"
+) -> Dict[str, float]:
+    """Total cost per name over the selected rows, keyed in the order names first appear."""
+    selected = np.frombuffer(column, dtype=np.int64)[rows]
+    # Codes are dense, so they index the totals directly. bincount adds the weights in
+    # row order, so each total matches a sequential sum.
+    totals = np.bincount(selected, weights=costs, minlength=len(codes))
+    first_rows = np.full(len(codes), len(selected), dtype=np.int64)
+    np.minimum.at(first_rows, selected, np.arange(len(selected)))
+    present = np.flatnonzero(first_rows < len(selected))
+    names = list(codes)
+    return {names[code]: float(totals[code]) for code in present[np.argsort(first_rows[present])]}
+
+
 class CostTracker:
     """Track and analyze costs for AI agent operations."""
 
@@ -60,6 +166,26 @@ class CostTracker:
         self._events: List[CostEvent] = []
         self._lock = threading.Lock()
         self._start_time = datetime.utcnow()
+        # Running totals over self._events, kept in step by record_cost and clear
+        self._total_cost = 0.0
+        self._by_agent: Dict[str, float] = defaultdict(float)
+        self._by_operation: Dict[str, float] = defaultdict(float)
+        self._by_model: Dict[str, float] = defaultdict(float)
+        # The same events as columns, one row per event in timestamp order: period
+        # queries bisect the timestamps and the report vectorizes over the rest. Agent,
+        # operation and model names are stored as codes into the *_codes dicts, which map
+        # each name to its code in first-seen order.
+        self._timestamps_us = array("q")  # microseconds since the epoch
+        self._costs = array("d")
+        self._input_costs = array("d")
+        self._output_costs = array("d")
+        self._tokens = array("q")
+        self._agent_column = array("q")
+        self._operation_column = array("q")
+        self._model_column = array("q")
+        self._agent_codes: Dict[str, int] = {}
+        self._operation_codes: Dict[str, int] = {}
+        self._model_codes: Dict[str, int] = {}
 
     def record_usage(
         self,
@@ -81,20 +207,13 @@ class CostTracker:
             cost: Actual cost if known (otherwise estimated)
             metadata: Additional metadata
         """
-        from .token_counter import TokenizerType, TokenUsage
-
         # Create TokenUsage object
-        if model.lower().startswith("gpt-4"):
-            tokenizer_type = TokenizerType.OPENAI_GPT4
-        elif model.lower().startswith("gpt-3.5") or "turbo" in model.lower():
-            tokenizer_type = TokenizerType.OPENAI_GPT35
-        elif "claude" in model.lower():
-            tokenizer_type = TokenizerType.ANTHROPIC_CLAUDE
-        else:
-            tokenizer_type = TokenizerType.APPROXIMATE
+        tokenizer_type = _MODEL_TOKENIZERS.get(model)
+        if tokenizer_type is None:
+            tokenizer_type = _MODEL_TOKENIZERS[model] = _tokenizer_for_model(model)
 
         # Estimate input/output split (80% input, 20% output typical)
-        input_tokens = int(tokens_used * 0.8)
+        input_tokens = tokens_used * 4 // 5
         output_tokens = tokens_used - input_tokens
 
         token_usage = TokenUsage(
@@ -105,13 +224,9 @@ class CostTracker:
             estimated=cost is None,
         )
 
-        # Override cost if provided
-        if cost is not None:
-            # Store original cost_estimate and override
-            original_cost = token_usage.cost_estimate
-            token_usage.__dict__["cost_estimate"] = cost
-
-        return self.record_cost(agent_id, operation, model, token_usage, metadata)
+        if cost is None:
+            cost = token_usage.cost_estimate
+        return self._record(agent_id, operation, model, token_usage, cost, metadata)
 
     def record_cost(
         self,
@@ -121,23 +236,139 @@ class CostTracker:
         token_usage: TokenUsage,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> CostEvent:
-        cost = token_usage.cost_estimate
-        event = CostEvent(
-            timestamp=datetime.utcnow(),
-            agent_id=agent_id,
-            operation=operation,
-            model=model,
-            token_usage=token_usage,
-            cost=cost,
-            metadata=metadata or {},
+        return self._record(
+            agent_id, operation, model, token_usage, token_usage.cost_estimate, metadata
         )
+
+    def _record(
+        self,
+        agent_id: Optional[str],
+        operation: str,
+        model: str,
+        token_usage: TokenUsage,
+        cost: float,
+        metadata: Optional[Dict[str, Any]],
+    ) -> CostEvent:
         with self._lock:
+            # Timestamped under the lock, so the events and columns stay in time order.
+            # The wall clock can be stepped back (by NTP, say); such events take the last
+            # recorded time instead, since period queries bisect the timestamps.
+            timestamp = datetime.utcnow()
+            if self._events and timestamp < self._events[-1].timestamp:
+                timestamp = self._events[-1].timestamp
+            event = CostEvent(
+                timestamp=timestamp,
+                agent_id=agent_id,
+                operation=operation,
+                model=model,
+                token_usage=token_usage,
+                cost=cost,
+                metadata=metadata or {},
+            )
             self._events.append(event)
+            self._index_event(event)
         return event
 
+    def _index_event(self, event: CostEvent) -> None:
+        self._total_cost += event.cost
+        self._by_agent[event.agent_id or "unknown"] += event.cost
+        self._by_operation[event.operation] += event.cost
+        self._by_model[event.model] += event.cost
+
+        usage = event.token_usage
+        self._timestamps_us.append((event.timestamp - _EPOCH) // _MICROSECOND)
+        self._costs.append(event.cost)
+        self._input_costs.append(estimate_cost(usage.input_tokens, usage.tokenizer_type, False))
+        self._output_costs.append(estimate_cost(usage.output_tokens, usage.tokenizer_type, True))
+        self._tokens.append(usage.total_tokens)
+        self._agent_column.append(_code(self._agent_codes, event.agent_id or "unknown"))
+        self._operation_column.append(_code(self._operation_codes, event.operation))
+        self._model_column.append(_code(self._model_codes, event.model))
+
+    def _rebuild_index(self) -> None:
+        self._total_cost = 0.0
+        self._by_agent.clear()
+        self._by_operation.clear()
+        self._by_model.clear()
+        for column in (
+            self._timestamps_us,
+            self._costs,
+            self._input_costs,
+            self._output_costs,
+            self._tokens,
+            self._agent_column,
+            self._operation_column,
+            self._model_column,
+        ):
+            del column[:]
+        for event in self._events:
+            self._index_event(event)
+
+    def _period_rows(self, start_time: datetime, end_time: datetime) -> Tuple[int, int]:
+        """
+        Row range low:high of the events with start_time <= timestamp <= end_time.
+
+        Events are timestamped under the lock as they are appended, never earlier than
+        the event before, so the rows are in time order and the range is found by
+        bisection. Call with the lock held.
+        """
+        timestamps = self._timestamps_us
+        low = bisect.bisect_left(timestamps, (start_time - _EPOCH) // _MICROSECOND)
+        high = bisect.bisect_right(timestamps, (end_time - _EPOCH) // _MICROSECOND)
+        return low, high
+
+    def _events_between(self, start_time: datetime, end_time: datetime) -> List[CostEvent]:
+        """Events with start_time <= timestamp <= end_time; call with the lock held."""
+        low, high = self._period_rows(start_time, end_time)
+        return self._events[low:high]
+
+    def _aggregate_columns(
+        self, start_time: datetime, end_time: datetime, agent_id: Optional[str] = None
+    ) -> Optional[Tuple]:
+        """
+        Report aggregates for the period computed from the columns with NumPy.
+
+        Returns None when the period has too few events to be worth vectorizing,
+        otherwise (event_count, by_agent, by_operation, by_model, by_time, input_cost,
+        output_cost, total_tokens), with each dict in the order its keys first occur, as
+        the Python loop builds them. Call with the lock held: the NumPy views borrow the
+        columns' buffers, which cannot be appended to until they are released.
+        """
+        if agent_id == "unknown":
+            return None  # The agent codes do not tell "unknown" apart from no agent id
+        low, high = self._period_rows(start_time, end_time)
+        if not NUMPY_AVAILABLE or high - low < _VECTORIZE_MIN_EVENTS:
+            return None
+
+        rows: Any = slice(low, high)
+        if agent_id is not None:
+            agents = np.frombuffer(self._agent_column, dtype=np.int64)[rows]
+            rows = low + np.flatnonzero(agents == self._agent_codes.get(agent_id, -1))
+
+        costs = np.frombuffer(self._costs, dtype=np.float64)[rows]
+        by_time = {}
+        if len(costs):
+            # Rows are in time order, so hours run from the first row's to the last row's
+            hours = np.frombuffer(self._timestamps_us, dtype=np.int64)[rows] // _HOUR_US
+            first_hour = int(hours[0])
+            hours -= first_hour
+            hour_costs = np.bincount(hours, weights=costs)
+            for hour in np.flatnonzero(np.bincount(hours)):
+                by_time[_hour_label(first_hour + int(hour))] = float(hour_costs[hour])
+        return (
+            len(costs),
+            _sum_by_code(self._agent_column, self._agent_codes, rows, costs),
+            _sum_by_code(self._operation_column, self._operation_codes, rows, costs),
+            _sum_by_code(self._model_column, self._model_codes, rows, costs),
+            by_time,
+            float(np.frombuffer(self._input_costs, dtype=np.float64)[rows].sum()),
+            float(np.frombuffer(self._output_costs, dtype=np.float64)[rows].sum()),
+            int(np.frombuffer(self._tokens, dtype=np.int64)[rows].sum()),
+        )
+
     def get_total_cost(self) -> float:
         with self._lock:
-            return sum(event.cost for event in self._events)
+            return self._total_cost
 
     def get_cost_for_period(
         self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
@@ -147,30 +378,20 @@ class CostTracker:
         if end_time is None:
             end_time = datetime.utcnow()
         with self._lock:
-            period_events = [e for e in self._events if start_time <= e.timestamp <= end_time]
-            return sum(event.cost for event in period_events)
+            low, high = self._period_rows(start_time, end_time)
+            return sum(self._costs[low:high])
 
     def get_cost_by_agent(self) -> Dict[str, float]:
         with self._lock:
-            by_agent = defaultdict(float)
-            for event in self._events:
-                agent_id = event.agent_id or "unknown"
-                by_agent[agent_id] += event.cost
-            return dict(by_agent)
+            return dict(self._by_agent)
 
     def get_cost_by_operation(self) -> Dict[str, float]:
         with self._lock:
-            by_operation = defaultdict(float)
-            for event in self._events:
-                by_operation[event.operation] += event.cost
-            return dict(by_operation)
+            return dict(self._by_operation)
 
     def get_cost_by_model(self) -> Dict[str, float]:
         with self._lock:
-            by_model = defaultdict(float)
-            for event in self._events:
-                by_model[event.model] += event.cost
-            return dict(by_model)
+            return dict(self._by_model)
 
     def get_cost_report(
         self,
@@ -183,153 +404,106 @@ class CostTracker:
             start_time = self._start_time
         if end_time is None:
             end_time = datetime.utcnow()
-
         with self._lock:
-            # Filter by agent if specified
-            events = self._events
-            if agent_id is not None:
-                events = [e for e in events if e.agent_id == agent_id]
-
-            period_events = [e for e in events if start_time <= e.timestamp <= end_time]
-            if not period_events:
-                return CostReport(
-                    start_time=start_time,
-                    end_time=end_time,
-                    total_cost=0.0,
-                    total_tokens=0,
-                    event_count=0,
-                    breakdown=CostBreakdown(),
-                )
-
-            by_agent = defaultdict(float)
-            by_operation = defaultdict(float)
-            by_model = defaultdict(float)
-            input_cost = 0.0
-            output_cost = 0.0
-            total_tokens = 0
-            by_time = defaultdict(float)
-
-            for event in period_events:
-                agent_key = event.agent_id or "unknown"
-                by_agent[agent_key] += event.cost
-                by_operation[event.operation] += event.cost
-                by_model[event.model] += event.cost
-
-                # Safe token cost calculation
-                try:
-                    from .token_counter import estimate_cost
-
-                    input_cost += estimate_cost(
-                        event.token_usage.input_tokens, event.token_usage.tokenizer_type, False
-                    )
-                    output_cost += estimate_cost(
-                        event.token_usage.output_tokens, event.token_usage.tokenizer_type, True
-                    )
-                except:
-                    # Fallback if estimate_cost fails
-                    input_cost += event.cost * 0.6  # Assume 60% input cost
-                    output_cost += event.cost * 0.4  # Assume 40% output cost
-
-                total_tokens += event.token_usage.total_tokens
-                time_bucket = event.timestamp.replace(minute=0, second=0, microsecond=0).isoformat()
-                by_time[time_bucket] += event.cost
-
-            breakdown = CostBreakdown(
-                by_agent=dict(by_agent),
-                by_operation=dict(by_operation),
-                by_model=dict(by_model),
-                by_time_period=dict(by_time),
-                input_cost=input_cost,
-                output_cost=output_cost,
-                total_cost=input_cost + output_cost,
-            )
+            return self._build_report(start_time, end_time, agent_id)
 
-            top_agents = sorted(by_agent.items(), key=lambda x: x[1], reverse=True)[:10]
-            top_operations = sorted(by_operation.items(), key=lambda x: x[1], reverse=True)[:10]
-            cost_trend = sorted(by_time.items())
-            recommendations = self._generate_recommendations(
-                breakdown, by_agent, by_operation, by_model
-            )
+    def get_report(
+        self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
+    ) -> CostReport:
+        return self.get_cost_report(None, start_time, end_time)
 
+    def _build_report(
+        self, start_time: datetime, end_time: datetime, agent_id: Optional[str]
+    ) -> CostReport:
+        """Report on the period's events, only agent_id's if given; call with the lock held."""
+        aggregates = self._aggregate_columns(start_time, end_time, agent_id)
+        if aggregates is None:
+            aggregates = self._aggregate_events(start_time, end_time, agent_id)
+        (
+            event_count,
+            by_agent,
+            by_operation,
+            by_model,
+            by_time,
+            input_cost,
+            output_cost,
+            total_tokens,
+        ) = aggregates
+        if not event_count:
             return CostReport(
                 start_time=start_time,
                 end_time=end_time,
-                total_cost=breakdown.total_cost,
-                total_tokens=total_tokens,
-                event_count=len(period_events),
-                breakdown=breakdown,
-                top_agents=top_agents,
-                top_operations=top_operations,
-                cost_trend=cost_trend,
-                recommendations=recommendations,
+                total_cost=0.0,
+                total_tokens=0,
+                event_count=0,
+                breakdown=CostBreakdown(),
             )
+        breakdown = CostBreakdown(
+            by_agent=dict(by_agent),
+            by_operation=dict(by_operation),
+            by_model=dict(by_model),
+            by_time_period=dict(by_time),
+            input_cost=input_cost,
+            output_cost=output_cost,
+            total_cost=input_cost + output_cost,
+        )
+        top_agents = sorted(by_agent.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_operations = sorted(by_operation.items(), key=lambda x: x[1], reverse=True)[:10]
+        cost_trend = sorted(by_time.items())
+        recommendations = self._generate_recommendations(
+            breakdown, by_agent, by_operation, by_model
+        )
+        return CostReport(
+            start_time=start_time,
+            end_time=end_time,
+            total_cost=breakdown.total_cost,
+            total_tokens=total_tokens,
+            event_count=event_count,
+            breakdown=breakdown,
+            top_agents=top_agents,
+            top_operations=top_operations,
+            cost_trend=cost_trend,
+            recommendations=recommendations,
+        )
 
-    def get_report(
-        self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
-    ) -> CostReport:
-        if start_time is None:
-            start_time = self._start_time
-        if end_time is None:
-            end_time = datetime.utcnow()
-        with self._lock:
-            period_events = [e for e in self._events if start_time <= e.timestamp <= end_time]
-            if not period_events:
-                return CostReport(
-                    start_time=start_time,
-                    end_time=end_time,
-                    total_cost=0.0,
-                    total_tokens=0,
-                    event_count=0,
-                    breakdown=CostBreakdown(),
-                )
-            by_agent = defaultdict(float)
-            by_operation = defaultdict(float)
-            by_model = defaultdict(float)
-            input_cost = 0.0
-            output_cost = 0.0
-            total_tokens = 0
-            by_time = defaultdict(float)
-            for event in period_events:
-                agent_id = event.agent_id or "unknown"
-                by_agent[agent_id] += event.cost
-                by_operation[event.operation] += event.cost
-                by_model[event.model] += event.cost
-                input_cost += estimate_cost(
-                    event.token_usage.input_tokens, event.token_usage.tokenizer_type, False
-                )
-                output_cost += estimate_cost(
-                    event.token_usage.output_tokens, event.token_usage.tokenizer_type, True
-                )
-                total_tokens += event.token_usage.total_tokens
-                time_bucket = event.timestamp.replace(minute=0, second=0, microsecond=0).isoformat()
-                by_time[time_bucket] += event.cost
-            breakdown = CostBreakdown(
-                by_agent=dict(by_agent),
-                by_operation=dict(by_operation),
-                by_model=dict(by_model),
-                by_time_period=dict(by_time),
-                input_cost=input_cost,
-                output_cost=output_cost,
-                total_cost=input_cost + output_cost,
-            )
-            top_agents = sorted(by_agent.items(), key=lambda x: x[1], reverse=True)[:10]
-            top_operations = sorted(by_operation.items(), key=lambda x: x[1], reverse=True)[:10]
-            cost_trend = sorted(by_time.items())
-            recommendations = self._generate_recommendations(
-                breakdown, by_agent, by_operation, by_model
+    def _aggregate_events(
+        self, start_time: datetime, end_time: datetime, agent_id: Optional[str]
+    ) -> Tuple:
+        """The aggregates _aggregate_columns returns, computed event by event."""
+        period_events = self._events_between(start_time, end_time)
+        if agent_id is not None:
+            period_events = [e for e in period_events if e.agent_id == agent_id]
+        by_agent = defaultdict(float)
+        by_operation = defaultdict(float)
+        by_model = defaultdict(float)
+        input_cost = 0.0
+        output_cost = 0.0
+        total_tokens = 0
+        by_hour = defaultdict(float)
+        for event in period_events:
+            by_agent[event.agent_id or "unknown"] += event.cost
+            by_operation[event.operation] += event.cost
+            by_model[event.model] += event.cost
+            input_cost += estimate_cost(
+                event.token_usage.input_tokens, event.token_usage.tokenizer_type, False
             )
-            return CostReport(
-                start_time=start_time,
-                end_time=end_time,
-                total_cost=breakdown.total_cost,
-                total_tokens=total_tokens,
-                event_count=len(period_events),
-                breakdown=breakdown,
-                top_agents=top_agents,
-                top_operations=top_operations,
-                cost_trend=cost_trend,
-                recommendations=recommendations,
+            output_cost += estimate_cost(
+                event.token_usage.output_tokens, event.token_usage.tokenizer_type, True
             )
+            total_tokens += event.token_usage.total_tokens
+            # Keyed by hour number; the ISO labels are only formatted once per hour below
+            by_hour[(event.timestamp - _EPOCH) // _HOUR] += event.cost
+        by_time = {_hour_label(hour): cost for hour, cost in by_hour.items()}
+        return (
+            len(period_events),
+            by_agent,
+            by_operation,
+            by_model,
+            by_time,
+            input_cost,
+            output_cost,
+            total_tokens,
+        )
 
     def _generate_recommendations(
         self,
@@ -357,40 +531,58 @@ class CostTracker:
             if before_time is None:
                 count = len(self._events)
                 self._events.clear()
+                self._rebuild_index()
                 return count
             else:
                 original_count = len(self._events)
-                self._events = [e for e in self._events if e.timestamp >= before_time]
+                low = bisect.bisect_left(
+                    self._timestamps_us, (before_time - _EPOCH) // _MICROSECOND
+                )
+                self._events = self._events[low:]
+                self._rebuild_index()
                 return original_count - len(self._events)
 
-    def export_events(self, format: str = "json") -> Any:
+    def export_events(self, format: str = "json", file: Optional[TextIO] = None) -> Any:
+        """
+        Export every recorded event as JSON or CSV.
+
+        Rows are serialized one at a time as they are written, rather than collected
+        first, so the export needs no more memory than a single row. JSON is encoded with
+        orjson when it is installed, which writes non-ASCII text as UTF-8 rather than
+        \\u escapes.
+
+        Args:
+            format: "json" or "csv"
+            file: Text stream to write to; when omitted the export is returned as a string
+
+        Returns:
+            The exported text, or None when written to file
+        """
         import csv
         import io
-        import json
+
+        if format not in ("json", "csv"):
+            raise ValueError(f"Unsupported format: {format}")
 
         with self._lock:
-            events_data = [
-                {
-                    "timestamp": e.timestamp.isoformat(),
-                    "agent_id": e.agent_id,
-                    "operation": e.operation,
-                    "model": e.model,
-                    "input_tokens": e.token_usage.input_tokens,
-                    "output_tokens": e.token_usage.output_tokens,
-                    "total_tokens": e.token_usage.total_tokens,
-                    "cost": e.cost,
-                    "metadata": e.metadata,
-                }
-                for e in self._events
-            ]
-            if format == "json":
-                return json.dumps(events_data, indent=2)
-            elif format == "csv":
-                output = io.StringIO()
-                if events_data:
-                    writer = csv.DictWriter(output, fieldnames=events_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(events_data)
-                return output.getvalue()
-            else:
-                raise ValueError(f"Unsupported format: {format}")
+            events = list(self._events)
+
+        output = file if file is not None else io.StringIO()
+        rows = (_event_row(e) for e in events)
+        if format == "json":
+            # Laid out like json.dumps(rows, indent=2), with each row indented one level
+            output.write("[")
+            separator = "\n  "
+            for row in rows:
+                output.write(separator)
+                output.write(_row_to_json(row).replace("\n", "\n  "))
+                separator = ",\n  "
+            output.write("\n]" if events else "]")
+        elif events:
+            writer = csv.DictWriter(output, fieldnames=_EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        if file is None:
+            return output.getvalue()
+        return None
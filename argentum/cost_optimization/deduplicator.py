@@ -2,13 +2,48 @@
 Request deduplication.
 """
 import hashlib
+import random
 import threading
+import time
+import zlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# MinHash permutations are (a * h + b) mod _MERSENNE_PRIME over 32-bit shingle hashes h,
+# with a and b below 2**32 so that a * h + b fits in an unsigned 64-bit integer.
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Below this many shingles the plain Python loop is faster than NumPy's per-call overhead.
+_VECTORIZE_MIN_SHINGLES = 16
+
+# Expired entries are only dropped on lookup, so every _SWEEP_INTERVAL inserts the least
+# recently used _SWEEP_SAMPLE entries are checked as well to keep cold entries from piling up.
+# The cache is split across _SHARD_COUNT independently locked shards; both sweep figures
+# are totals across all shards.
+_SWEEP_INTERVAL = 1024
+_SWEEP_SAMPLE = 256
+_SHARD_COUNT = 16  # power of two, so a fingerprint's shard is fingerprint & (_SHARD_COUNT - 1)
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class DuplicateDetectionResult:
     is_duplicate: bool
     original_request_id: Optional[str] = None
@@ -16,46 +51,207 @@ class DuplicateDetectionResult:
     cached_response: Optional[Any] = None
 
 
+class _MinHashLSH:
+    """Banded MinHash index over word shingles for near-duplicate lookup."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, seed: int = 1):
+        rng = random.Random(seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._perms = [
+            (rng.randrange(1, _MAX_HASH + 1), rng.randrange(0, _MAX_HASH + 1))
+            for _ in range(num_perm)
+        ]
+        if NUMPY_AVAILABLE:
+            self._perm_a = np.array([a for a, _ in self._perms], dtype=np.uint64)[:, None]
+            self._perm_b = np.array([b for _, b in self._perms], dtype=np.uint64)[:, None]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+
+    def signature(self, words: List[str]) -> Tuple[int, ...]:
+        k = self.shingle_size
+        if len(words) <= k:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+        hashes = [zlib.crc32(s.encode()) for s in shingles]
+        if NUMPY_AVAILABLE and len(hashes) >= _VECTORIZE_MIN_SHINGLES:
+            # All permutations of all shingle hashes at once, as a (num_perm, shingles) array
+            permuted = (self._perm_a * np.array(hashes, dtype=np.uint64) + self._perm_b) % (
+                np.uint64(_MERSENNE_PRIME)
+            )
+            return tuple((permuted.min(axis=1) & np.uint64(_MAX_HASH)).tolist())
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH for a, b in self._perms
+        )
+
+    def insert(self, key: int, signature: Tuple[int, ...]) -> None:
+        self.remove(key)
+        self._signatures[key] = signature
+        for band in self._band_keys(signature):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band in self._band_keys(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def query(self, signature: Tuple[int, ...]) -> Set[int]:
+        candidates: Set[int] = set()
+        for band in self._band_keys(signature):
+            candidates.update(self._buckets.get(band, ()))
+        return candidates
+
+    def similarity(self, signature: Tuple[int, ...], key: int) -> float:
+        other = self._signatures.get(key)
+        if other is None:
+            return 0.0
+        return sum(1 for a, b in zip(signature, other) if a == b) / len(signature)
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows : (band + 1) * rows]
+
+
+class _Shard:
+    """One lock-striped slice of the deduplicator's cache and request indexes."""
+
+    def __init__(self):
+        self.cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self.fingerprint_to_request: Dict[int, str] = {}
+        self.insertions_since_sweep = 0
+        self.lock = threading.Lock()
+
+
 class RequestDeduplicator:
+    """
+    Detect repeated prompts and return the response cached for the first one.
+
+    Matching is exact on the normalized prompt by default. enable_semantic_matching
+    adds a MinHash lookup for near-duplicates; it is lossy (prompts that share most of
+    their text but differ in a detail such as an id can match) and costs a signature
+    per prompt, so it is opt-in.
+    """
+
     def __init__(
         self,
-        enable_semantic_matching: bool = True,
+        enable_semantic_matching: bool = False,
         similarity_threshold: float = 0.85,
         ttl_seconds: int = 3600,
+        max_entries: int = 10_000,
     ):
         self.enable_semantic_matching = enable_semantic_matching
         self.similarity_threshold = similarity_threshold
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, tuple] = {}
-        self._request_map: Dict[str, str] = {}
-        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self._shards = [_Shard() for _ in range(_SHARD_COUNT)]
+        self._shard_max_entries = max(1, -(-max_entries // _SHARD_COUNT))
+        self._lsh = _MinHashLSH() if enable_semantic_matching else None
+        # Lock order: a shard lock may be held while taking _lsh_lock, never the reverse
+        self._lsh_lock = threading.Lock()
 
     def check_duplicate(self, request_id: str, prompt: str) -> DuplicateDetectionResult:
-        fingerprint = self._fingerprint(prompt)
-        with self._lock:
-            if fingerprint in self._cache:
-                response, timestamp = self._cache[fingerprint]
-                if (datetime.utcnow() - timestamp).total_seconds() < self.ttl_seconds:
-                    self._request_map[request_id] = fingerprint
+        normalized = self._normalize(prompt)
+        fingerprint = self._fingerprint(normalized)
+        shard = self._shard(fingerprint)
+        with shard.lock:
+            entry = shard.cache.get(fingerprint)
+            if entry is not None:
+                response, timestamp = entry
+                if self._is_fresh(timestamp):
+                    shard.cache.move_to_end(fingerprint)
+                    shard.fingerprint_to_request.setdefault(fingerprint, request_id)
                     return DuplicateDetectionResult(
-                        True, self._find_original_request(fingerprint), 1.0, response
+                        True, shard.fingerprint_to_request.get(fingerprint), 1.0, response
                     )
                 else:
-                    del self._cache[fingerprint]
+                    self._evict(shard, fingerprint)
+        if self._lsh is not None:
+            return self._check_semantic_duplicate(request_id, normalized)
         return DuplicateDetectionResult(False)
 
     def cache_response(self, request_id: str, prompt: str, response: Any):
-        fingerprint = self._fingerprint(prompt)
-        with self._lock:
-            self._cache[fingerprint] = (response, datetime.utcnow())
-            self._request_map[request_id] = fingerprint
-
-    def _fingerprint(self, prompt: str) -> str:
-        normalized = " ".join(prompt.lower().strip().split())
-        return hashlib.md5(normalized.encode()).hexdigest()
-
-    def _find_original_request(self, fingerprint: str) -> Optional[str]:
-        for req_id, fp in self._request_map.items():
-            if fp == fingerprint:
-                return req_id
-        return None
+        normalized = self._normalize(prompt)
+        fingerprint = self._fingerprint(normalized)
+        signature = self._lsh.signature(normalized.split()) if self._lsh is not None else None
+        shard = self._shard(fingerprint)
+        with shard.lock:
+            shard.cache[fingerprint] = (response, time.monotonic())
+            shard.cache.move_to_end(fingerprint)
+            if len(shard.cache) > self._shard_max_entries:
+                self._evict(shard, next(iter(shard.cache)))
+            shard.fingerprint_to_request.setdefault(fingerprint, request_id)
+            if signature is not None:
+                with self._lsh_lock:
+                    self._lsh.insert(fingerprint, signature)
+            shard.insertions_since_sweep += 1
+            if shard.insertions_since_sweep >= _SWEEP_INTERVAL // _SHARD_COUNT:
+                shard.insertions_since_sweep = 0
+                self._sweep_expired(shard)
+
+    def _check_semantic_duplicate(
+        self, request_id: str, normalized: str
+    ) -> DuplicateDetectionResult:
+        signature = self._lsh.signature(normalized.split())
+        with self._lsh_lock:
+            scored = [
+                (self._lsh.similarity(signature, candidate), candidate)
+                for candidate in self._lsh.query(signature)
+            ]
+        scored.sort(reverse=True)
+        for score, candidate in scored:
+            if score < self.similarity_threshold:
+                break
+            shard = self._shard(candidate)
+            with shard.lock:
+                entry = shard.cache.get(candidate)
+                if entry is None or not self._is_fresh(entry[1]):
+                    self._evict(shard, candidate)
+                    continue
+                shard.cache.move_to_end(candidate)
+                return DuplicateDetectionResult(
+                    True, shard.fingerprint_to_request.get(candidate), score, entry[0]
+                )
+        return DuplicateDetectionResult(False)
+
+    def _shard(self, fingerprint: int) -> _Shard:
+        return self._shards[fingerprint & (_SHARD_COUNT - 1)]
+
+    def _is_fresh(self, timestamp: float) -> bool:
+        return time.monotonic() - timestamp < self.ttl_seconds
+
+    def _sweep_expired(self, shard: _Shard) -> None:
+        sample = _SWEEP_SAMPLE // _SHARD_COUNT
+        now = time.monotonic()
+        expired = [
+            fp
+            for fp, (_, timestamp) in islice(shard.cache.items(), sample)
+            if now - timestamp >= self.ttl_seconds
+        ]
+        for fingerprint in expired:
+            self._evict(shard, fingerprint)
+
+    def _evict(self, shard: _Shard, fingerprint: int) -> None:
+        shard.cache.pop(fingerprint, None)
+        shard.fingerprint_to_request.pop(fingerprint, None)
+        if self._lsh is not None:
+            with self._lsh_lock:
+                self._lsh.remove(fingerprint)
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        return " ".join(prompt.lower().strip().split())
+
+    def _fingerprint(self, normalized: str) -> int:
+        data = normalized.encode()
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(data)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
@@ -3,7 +3,19 @@ Cost-aware model selection.
 """
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ._compat import DATACLASS_SLOTS
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Below this many registered models the plain Python scan is faster than building arrays.
+_VECTORIZE_MIN_MODELS = 32
 
 
 class ModelTier(Enum):
@@ -14,7 +26,7 @@ class ModelTier(Enum):
     ULTRA_EXPENSIVE = "ultra_expensive"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ModelConfig:
     name: str
     tier: ModelTier
@@ -25,7 +37,7 @@ class ModelConfig:
     quality_score: float = 1.0
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ModelRecommendation:
     recommended_model: str
     alternative_models: List[str] = field(default_factory=list)
@@ -37,6 +49,9 @@ class ModelRecommendation:
 class ModelSelector:
     def __init__(self):
         self._models: Dict[str, ModelConfig] = {}
+        self._capability_sets: Dict[str, FrozenSet[str]] = {}
+        self._capability_bits: Dict[str, int] = {}
+        self._model_arrays: Optional[tuple] = None
         self._default_models()
 
     def _default_models(self):
@@ -76,6 +91,11 @@ class ModelSelector:
 
     def register_model(self, config: ModelConfig):
         self._models[config.name] = config
+        self._capability_sets[config.name] = frozenset(config.capabilities)
+        for capability in config.capabilities:
+            if capability not in self._capability_bits:
+                self._capability_bits[capability] = 1 << len(self._capability_bits)
+        self._model_arrays = None
 
     def select_model(
         self,
@@ -88,10 +108,52 @@ class ModelSelector:
         min_quality: float = 0.7,
     ) -> ModelRecommendation:
         required_capabilities = required_capabilities or []
+        if (
+            NUMPY_AVAILABLE
+            and len(self._models) >= _VECTORIZE_MIN_MODELS
+            and len(self._capability_bits) <= 64
+        ):
+            candidates = self._vectorized_candidates(
+                required_capabilities,
+                estimated_input_tokens,
+                estimated_output_tokens,
+                max_cost,
+                prefer_cheap,
+                min_quality,
+            )
+        else:
+            candidates = self._scan_candidates(
+                required_capabilities,
+                estimated_input_tokens,
+                estimated_output_tokens,
+                max_cost,
+                prefer_cheap,
+                min_quality,
+            )
+        if not candidates:
+            if self._models:
+                cheapest = min(self._models.items(), key=lambda x: x[1].input_cost_per_token)
+                return ModelRecommendation(cheapest[0], [], 0.0, 0.3, "No suitable model found")
+            raise ValueError("No models registered")
+        recommended_name, recommended_config, estimated_cost = candidates[0]
+        alternatives = [name for name, _, _ in candidates[1:3]]
+        return ModelRecommendation(
+            recommended_name, alternatives, estimated_cost, 0.9, f"Selected {recommended_name}"
+        )
+
+    def _scan_candidates(
+        self,
+        required_capabilities: List[str],
+        estimated_input_tokens: int,
+        estimated_output_tokens: int,
+        max_cost: Optional[float],
+        prefer_cheap: bool,
+        min_quality: float,
+    ) -> List[Tuple[str, ModelConfig, float]]:
         candidates = []
         for name, config in self._models.items():
-            if required_capabilities and not all(
-                c in config.capabilities for c in required_capabilities
+            if required_capabilities and not self._capability_sets[name].issuperset(
+                required_capabilities
             ):
                 continue
             if config.quality_score < min_quality or estimated_input_tokens > config.max_tokens:
@@ -103,17 +165,64 @@ class ModelSelector:
             if max_cost and cost > max_cost:
                 continue
             candidates.append((name, config, cost))
-        if not candidates:
-            if self._models:
-                cheapest = min(self._models.items(), key=lambda x: x[1].input_cost_per_token)
-                return ModelRecommendation(cheapest[0], [], 0.0, 0.3, "No suitable model found")
-            raise ValueError("No models registered")
         if prefer_cheap:
             candidates.sort(key=lambda x: x[2])
         else:
             candidates.sort(key=lambda x: x[1].quality_score / max(x[2], 0.0001), reverse=True)
-        recommended_name, recommended_config, estimated_cost = candidates[0]
-        alternatives = [name for name, _, _ in candidates[1:3]]
-        return ModelRecommendation(
-            recommended_name, alternatives, estimated_cost, 0.9, f"Selected {recommended_name}"
+        return candidates
+
+    def _vectorized_candidates(
+        self,
+        required_capabilities: List[str],
+        estimated_input_tokens: int,
+        estimated_output_tokens: int,
+        max_cost: Optional[float],
+        prefer_cheap: bool,
+        min_quality: float,
+    ) -> List[Tuple[str, ModelConfig, float]]:
+        required_mask = 0
+        for capability in required_capabilities:
+            bit = self._capability_bits.get(capability)
+            if bit is None:
+                return []
+            required_mask |= bit
+        if self._model_arrays is None:
+            configs = list(self._models.values())
+            self._model_arrays = (
+                configs,
+                np.array([c.input_cost_per_token for c in configs], dtype=np.float64),
+                np.array([c.output_cost_per_token for c in configs], dtype=np.float64),
+                np.array([c.max_tokens for c in configs], dtype=np.int64),
+                np.array([c.quality_score for c in configs], dtype=np.float64),
+                np.array(
+                    [
+                        sum(self._capability_bits[cap] for cap in self._capability_sets[c.name])
+                        for c in configs
+                    ],
+                    dtype=np.uint64,
+                ),
+            )
+        (
+            configs,
+            input_costs,
+            output_costs,
+            max_tokens,
+            quality,
+            capability_bits,
+        ) = self._model_arrays
+        required = np.uint64(required_mask)
+        mask = (
+            ((capability_bits & required) == required)
+            & (quality >= min_quality)
+            & (max_tokens >= estimated_input_tokens)
         )
+        costs = estimated_input_tokens * input_costs + estimated_output_tokens * output_costs
+        if max_cost:
+            mask &= costs <= max_cost
+        indices = np.flatnonzero(mask)
+        if prefer_cheap:
+            order = indices[np.argsort(costs[indices], kind="stable")]
+        else:
+            scores = quality[indices] / np.maximum(costs[indices], 0.0001)
+            order = indices[np.argsort(-scores, kind="stable")]
+        return [(configs[i].name, configs[i], float(costs[i])) for i in order]
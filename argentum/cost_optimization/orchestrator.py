@@ -1,10 +1,13 @@
 """
 Cost optimization orchestrator.
 """
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from ._compat import DATACLASS_SLOTS
 from .batch_optimizer import BatchOptimizer
 from .budget_allocator import AllocationStrategy, BudgetAllocator
 from .cache import CacheConfig, CacheLayer
@@ -17,6 +20,11 @@ from .prompt_optimizer import PromptOptimizer
 from .token_budget import BudgetExceededError, TokenBudgetManager
 from .token_counter import TokenCounter, TokenizerType, TokenUsage
 
+# optimize_request remembers the prompt and context optimization outcome for this many
+# distinct (prompt, context) pairs, so repeated requests skip straight to model selection
+# and the budget check
+_PREPARED_REQUEST_CACHE_SIZE = 1024
+
 
 @dataclass
 class OptimizationConfig:
@@ -36,7 +44,7 @@ class OptimizationConfig:
     max_batch_size: int = 10
     batch_timeout_seconds: int = 5
     enable_deduplication: bool = True
-    semantic_deduplication: bool = True
+    semantic_deduplication: bool = False  # Lossy near-duplicate matching; opt-in
     enable_context_pruning: bool = False
     pruning_strategy: PruningStrategy = PruningStrategy.BALANCED
     max_context_items: int = 50
@@ -44,7 +52,7 @@ class OptimizationConfig:
     allocation_strategy: AllocationStrategy = AllocationStrategy.EQUAL
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OptimizationResult:
     success: bool
     cost_saved: float
@@ -112,6 +120,12 @@ class CostOptimizationOrchestrator:
             if self.config.enable_budget_allocation
             else None
         )
+        # (prompt, context) -> (input_tokens, tokens_saved, optimizations), least recently
+        # used first
+        self._prepared_requests: "OrderedDict[tuple, Tuple[int, int, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._prepared_requests_lock = threading.Lock()
 
     def optimize_request(
         self,
@@ -145,24 +159,10 @@ class CostOptimizationOrchestrator:
                     return OptimizationResult(
                         True, cost_saved, 0, optimizations_applied, None, True
                     )
-            original_prompt = prompt
-            if self.prompt_optimizer:
-                prompt_result = self.prompt_optimizer.optimize(prompt)
-                if prompt_result.reduction_percentage > 5:
-                    prompt = prompt_result.optimized_prompt
-                    tokens_saved += prompt_result.original_tokens - prompt_result.optimized_tokens
-                    optimizations_applied.append("prompt_optimization")
-            optimized_context = context
-            if self.context_optimizer and context:
-                optimized_context, opt_result = self.context_optimizer.optimize(context)
-                if opt_result.reduction_percentage > 0:
-                    tokens_saved += opt_result.original_tokens - opt_result.optimized_tokens
-                    optimizations_applied.append("context_optimization")
-            input_tokens = self.token_counter.count(prompt).total_tokens
-            if optimized_context:
-                input_tokens += sum(
-                    self.token_counter.count(str(v)).total_tokens for _, v, _ in optimized_context
-                )
+            input_tokens, tokens_saved, prepared_optimizations = self._prepare_request(
+                prompt, context
+            )
+            optimizations_applied.extend(prepared_optimizations)
             if self.model_selector and not model:
                 recommendation = self.model_selector.select_model(
                     estimated_input_tokens=input_tokens,
@@ -186,6 +186,50 @@ class CostOptimizationOrchestrator:
                 False, 0.0, tokens_saved, optimizations_applied, None, False, str(e)
             )
 
+    def _prepare_request(
+        self, prompt: str, context: Optional[List]
+    ) -> Tuple[int, int, Tuple[str, ...]]:
+        """
+        Optimize the prompt and context and count the input tokens.
+
+        Returns (input_tokens, tokens_saved, optimizations applied). The outcome depends
+        only on the prompt and context, so it is remembered per request. The request
+        itself is the key, so a lookup compares it in full and never confuses two.
+        """
+        key = (prompt, tuple((k, str(v), imp) for k, v, imp in context or ()))
+        with self._prepared_requests_lock:
+            prepared = self._prepared_requests.get(key)
+            if prepared is not None:
+                self._prepared_requests.move_to_end(key)
+                return prepared
+
+        tokens_saved = 0
+        optimizations_applied = []
+        if self.prompt_optimizer:
+            prompt_result = self.prompt_optimizer.optimize(prompt)
+            if prompt_result.reduction_percentage > 5:
+                prompt = prompt_result.optimized_prompt
+                tokens_saved += prompt_result.original_tokens - prompt_result.optimized_tokens
+                optimizations_applied.append("prompt_optimization")
+        optimized_context = context
+        if self.context_optimizer and context:
+            optimized_context, opt_result = self.context_optimizer.optimize(context)
+            if opt_result.reduction_percentage > 0:
+                tokens_saved += opt_result.original_tokens - opt_result.optimized_tokens
+                optimizations_applied.append("context_optimization")
+        # Count the prompt and every context item in one batch
+        texts = [prompt]
+        if optimized_context:
+            texts.extend(str(v) for _, v, _ in optimized_context)
+        input_tokens = sum(self.token_counter.count_batch(texts))
+
+        prepared = (input_tokens, tokens_saved, tuple(optimizations_applied))
+        with self._prepared_requests_lock:
+            self._prepared_requests[key] = prepared
+            if len(self._prepared_requests) > _PREPARED_REQUEST_CACHE_SIZE:
+                self._prepared_requests.popitem(last=False)
+        return prepared
+
     def record_cost(
         self,
         agent_id: Optional[str],
@@ -5,10 +5,64 @@ import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from ._compat import DATACLASS_SLOTS
 from .token_counter import TokenCounter, TokenizerType
 
+try:
+    import ahocorasick
 
-@dataclass
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Filler dropped in aggressive mode, and wordy phrases shortened in every mode. Each table
+# is applied in a single left-to-right pass that replaces the longest phrase starting at
+# each position: with an Aho-Corasick automaton when pyahocorasick is installed, otherwise
+# with a compiled alternation of the phrases, longest first.
+_FILLER_PHRASES = {
+    "please ": "",
+    "kindly ": "",
+    "I would like you to ": "",
+    "Could you please ": "",
+}
+_SIMPLIFICATIONS = {
+    "in order to": "to",
+    "due to the fact that": "because",
+    "for the purpose of": "for",
+}
+_REPEATED_SPACES_RE = re.compile("  +")
+
+
+def _phrase_matcher(table: Dict[str, str]):
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for phrase, replacement in table.items():
+            automaton.add_word(phrase, (len(phrase), replacement))
+        automaton.make_automaton()
+        return automaton
+    return re.compile(
+        "|".join(re.escape(phrase) for phrase in sorted(table, key=len, reverse=True))
+    )
+
+
+def _replace_phrases(text: str, table: Dict[str, str], matcher) -> str:
+    if not AHOCORASICK_AVAILABLE:
+        return matcher.sub(lambda match: table[match[0]], text)
+    parts = []
+    position = 0
+    for end, (length, replacement) in matcher.iter_long(text):
+        parts.append(text[position : end + 1 - length])
+        parts.append(replacement)
+        position = end + 1
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+_FILLER_MATCHER = _phrase_matcher(_FILLER_PHRASES)
+_SIMPLIFICATIONS_MATCHER = _phrase_matcher(_SIMPLIFICATIONS)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class PromptOptimizationResult:
     original_prompt: str
     optimized_prompt: str
@@ -29,26 +83,12 @@ class PromptOptimizer:
     def optimize(self, prompt: str) -> PromptOptimizationResult:
         original_tokens = self.token_counter.count(prompt).total_tokens
         optimizations_applied = []
-        optimized = prompt
-        optimized = re.sub(r" +", " ", optimized)
+        optimized = _REPEATED_SPACES_RE.sub(" ", prompt)
         optimizations_applied.append("removed_redundant_whitespace")
         if self.aggressive:
-            replacements = {
-                "please ": "",
-                "kindly ": "",
-                "I would like you to ": "",
-                "Could you please ": "",
-            }
-            for old, new in replacements.items():
-                optimized = optimized.replace(old, new)
+            optimized = _replace_phrases(optimized, _FILLER_PHRASES, _FILLER_MATCHER)
             optimizations_applied.append("removed_unnecessary_words")
-        replacements = {
-            "in order to": "to",
-            "due to the fact that": "because",
-            "for the purpose of": "for",
-        }
-        for old, new in replacements.items():
-            optimized = optimized.replace(old, new)
+        optimized = _replace_phrases(optimized, _SIMPLIFICATIONS, _SIMPLIFICATIONS_MATCHER)
         optimizations_applied.append("simplified_phrases")
         optimized_tokens = self.token_counter.count(optimized).total_tokens
         reduction = (
@@ -11,6 +11,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Callable, Dict, List, Optional
 
+from ._compat import DATACLASS_SLOTS
+
 # Import ArgentumError - handle package structure flexibly
 try:
     from argentum.exceptions import ArgentumError
@@ -55,7 +57,18 @@ class BudgetStatus(Enum):
     EXCEEDED = "exceeded"  # Budget exceeded
 
 
-@dataclass
+class _PendingUsage:
+    """One thread's consumed tokens that have not been added to the shared counters yet."""
+
+    def __init__(self):
+        self.owner = threading.current_thread()
+        self.lock = threading.Lock()
+        self.total = 0
+        self.per_agent: Dict[str, int] = {}
+        self.consumes = 0
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BudgetAlert:
     """Budget alert information."""
 
@@ -68,7 +81,7 @@ class BudgetAlert:
     message: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BudgetInfo:
     """Budget information snapshot."""
 
@@ -98,8 +111,17 @@ class TokenBudgetManager:
         on_alert: Optional[Callable[[BudgetAlert], None]] = None,
         enable_rollover: bool = False,
         rollover_percentage: float = 0.1,
+        flush_interval: int = 1,
     ):
-        """Initialize token budget manager."""
+        """
+        Initialize token budget manager.
+
+        With flush_interval above 1, consume() coalesces usage per thread and adds it to
+        the shared counters, taking the lock, only every flush_interval calls. Each
+        thread's check then sees the shared counters plus its own pending tokens, so
+        concurrent threads can together overshoot the budget by up to their unflushed
+        tokens. Status, usage, refund and reset queries flush every thread first.
+        """
         if total_budget <= 0:
             raise ValueError("total_budget must be positive")
         if not 0 <= alert_threshold <= 1:
@@ -116,39 +138,61 @@ class TokenBudgetManager:
         self.on_alert = on_alert
         self.enable_rollover = enable_rollover
         self.rollover_percentage = rollover_percentage
+        self.flush_interval = flush_interval
 
         self._current_usage = 0
         self._per_agent_usage: Dict[str, int] = {}
         self._alerts: List[BudgetAlert] = []
         self._lock = threading.Lock()
         self._alerted_statuses: set = set()
+        # Per-thread usage waiting to be flushed, when flush_interval > 1. Lock order:
+        # a _PendingUsage lock may be taken while holding _lock, never the reverse.
+        self._local = threading.local()
+        self._pending: List[_PendingUsage] = []
 
     def can_afford(self, tokens: int, agent_id: Optional[str] = None) -> bool:
-        """Check if budget can afford the requested tokens."""
-        with self._lock:
-            # Check global budget
-            if self._current_usage + tokens > self.total_budget:
+        """
+        Check if budget can afford the requested tokens.
+
+        Reads the usage counters without taking the lock. Each read is atomic, so the
+        answer is at worst stale by a consume() running at the same time, and consume()
+        repeats the check under the lock before it commits any tokens.
+        """
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            return self._fits(tokens, agent_id)
+        return self._fits(tokens, agent_id, pending.total, pending.per_agent.get(agent_id, 0))
+
+    def _fits(
+        self,
+        tokens: int,
+        agent_id: Optional[str],
+        pending_usage: int = 0,
+        pending_agent_usage: int = 0,
+    ) -> bool:
+        """The can_afford check against the shared counters plus any unflushed usage."""
+        current_usage = self._current_usage + pending_usage
+        # Check global budget
+        if current_usage + tokens > self.total_budget:
+            if self.enable_rollover:
+                max_budget = int(self.total_budget * (1 + self.rollover_percentage))
+                if current_usage + tokens > max_budget:
+                    return False
+            else:
+                return False
+
+        # Check per-agent budget if specified
+        if agent_id and self.per_agent_budget:
+            agent_usage = self._per_agent_usage.get(agent_id, 0) + pending_agent_usage
+            if agent_usage + tokens > self.per_agent_budget:
                 if self.enable_rollover:
-                    max_budget = int(self.total_budget * (1 + self.rollover_percentage))
-                    if self._current_usage + tokens > max_budget:
+                    max_agent_budget = int(self.per_agent_budget * (1 + self.rollover_percentage))
+                    if agent_usage + tokens > max_agent_budget:
                         return False
                 else:
                     return False
 
-            # Check per-agent budget if specified
-            if agent_id and self.per_agent_budget:
-                agent_usage = self._per_agent_usage.get(agent_id, 0)
-                if agent_usage + tokens > self.per_agent_budget:
-                    if self.enable_rollover:
-                        max_agent_budget = int(
-                            self.per_agent_budget * (1 + self.rollover_percentage)
-                        )
-                        if agent_usage + tokens > max_agent_budget:
-                            return False
-                    else:
-                        return False
-
-            return True
+        return True
 
     def can_afford_agent(self, agent_id: str, tokens: int) -> bool:
         """Check if agent-specific budget can afford tokens."""
@@ -159,18 +203,13 @@ class TokenBudgetManager:
         if tokens < 0:
             raise ValueError("tokens must be non-negative")
 
+        if self.flush_interval > 1:
+            self._consume_coalesced(tokens, agent_id)
+            return
+
         with self._lock:
-            if not self.can_afford(tokens, agent_id):
-                raise BudgetExceededError(
-                    f"Budget exceeded: cannot consume {tokens} tokens. "
-                    f"Current usage: {self._current_usage}/{self.total_budget}",
-                    {
-                        "tokens_requested": tokens,
-                        "current_usage": self._current_usage,
-                        "total_budget": self.total_budget,
-                        "agent_id": agent_id,
-                    },
-                )
+            if not self._fits(tokens, agent_id):
+                raise self._exceeded_error(tokens, agent_id)
 
             self._current_usage += tokens
 
@@ -181,12 +220,74 @@ class TokenBudgetManager:
 
             self._check_alerts(agent_id)
 
+    def flush(self) -> None:
+        """Add every thread's coalesced usage to the shared counters."""
+        with self._lock:
+            self._flush_pending()
+
+    def _consume_coalesced(self, tokens: int, agent_id: Optional[str]) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = _PendingUsage()
+            with self._lock:
+                self._pending.append(pending)
+        with pending.lock:
+            agent_pending = pending.per_agent.get(agent_id, 0) if agent_id else 0
+            if not self._fits(tokens, agent_id, pending.total, agent_pending):
+                raise self._exceeded_error(tokens, agent_id)
+            pending.total += tokens
+            if agent_id:
+                pending.per_agent[agent_id] = agent_pending + tokens
+            pending.consumes += 1
+            if pending.consumes < self.flush_interval:
+                return
+        with self._lock:
+            self._drain(pending)
+            self._check_alerts(agent_id)
+
+    def _flush_pending(self) -> None:
+        """
+        Drain every thread's pending usage and raise any alerts it crosses.
+
+        Call with the lock held.
+        """
+        if not self._pending:
+            return
+        for pending in self._pending:
+            self._drain(pending)
+        # A finished thread adds nothing more once drained
+        self._pending = [pending for pending in self._pending if pending.owner.is_alive()]
+        self._check_alerts()
+
+    def _drain(self, pending: _PendingUsage) -> None:
+        """Move one thread's pending usage into the shared counters; call with the lock held."""
+        with pending.lock:
+            self._current_usage += pending.total
+            for agent_id, tokens in pending.per_agent.items():
+                self._per_agent_usage[agent_id] = self._per_agent_usage.get(agent_id, 0) + tokens
+            pending.total = 0
+            pending.per_agent = {}
+            pending.consumes = 0
+
+    def _exceeded_error(self, tokens: int, agent_id: Optional[str]) -> BudgetExceededError:
+        return BudgetExceededError(
+            f"Budget exceeded: cannot consume {tokens} tokens. "
+            f"Current usage: {self._current_usage}/{self.total_budget}",
+            {
+                "tokens_requested": tokens,
+                "current_usage": self._current_usage,
+                "total_budget": self.total_budget,
+                "agent_id": agent_id,
+            },
+        )
+
     def refund(self, tokens: int, agent_id: Optional[str] = None) -> None:
         """Refund tokens to budget."""
         if tokens < 0:
             raise ValueError("tokens must be non-negative")
 
         with self._lock:
+            self._flush_pending()
             self._current_usage = max(0, self._current_usage - tokens)
 
             if agent_id and agent_id in self._per_agent_usage:
@@ -195,6 +296,7 @@ class TokenBudgetManager:
     def get_status(self) -> BudgetInfo:
         """Get current budget status."""
         with self._lock:
+            self._flush_pending()
             usage_pct = self._current_usage / self.total_budget if self.total_budget > 0 else 0
 
             if usage_pct >= 1.0:
@@ -219,11 +321,13 @@ class TokenBudgetManager:
     def get_agent_usage(self, agent_id: str) -> int:
         """Get token usage for a specific agent."""
         with self._lock:
+            self._flush_pending()
             return self._per_agent_usage.get(agent_id, 0)
 
     def reset(self, agent_id: Optional[str] = None) -> None:
         """Reset budget usage."""
         with self._lock:
+            self._flush_pending()
             if agent_id:
                 if agent_id in self._per_agent_usage:
                     refunded = self._per_agent_usage[agent_id]
@@ -5,10 +5,30 @@ Provides token counting for multiple tokenizers (OpenAI, Anthropic, etc.)
 with accurate pre-call estimation and post-call verification.
 """
 
-import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ._compat import DATACLASS_SLOTS
+
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# tiktoken counts are remembered for the last _COUNT_CACHE_SIZE distinct texts, keyed by
+# a 64-bit fingerprint of the text; a count depends on nothing but the text
+_COUNT_CACHE_SIZE = 8192
+
+
+def _fingerprint(text: str) -> int:
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(text.encode())
+    return hash(text)
 
 
 class TokenizerType(Enum):
@@ -21,7 +41,16 @@ class TokenizerType(Enum):
     APPROXIMATE = "approximate"  # Fast approximation (4 chars = 1 token)
 
 
-@dataclass
+# Rough (input, output) USD per token as of 2024, for cost_estimate and estimate_cost.
+# Tokenizer types without an entry are priced at zero.
+_TOKEN_PRICING: Dict[TokenizerType, Tuple[float, float]] = {
+    TokenizerType.OPENAI_GPT4: (0.00003, 0.00006),
+    TokenizerType.OPENAI_GPT35: (0.0000015, 0.000002),
+    TokenizerType.ANTHROPIC_CLAUDE: (0.000008, 0.000024),
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class TokenUsage:
     """Token usage information."""
 
@@ -39,18 +68,11 @@ class TokenUsage:
         Returns:
             Estimated cost in USD (rough estimates)
         """
-        # Rough pricing estimates (as of 2024)
-        pricing = {
-            TokenizerType.OPENAI_GPT4: {"input": 0.00003, "output": 0.00006},
-            TokenizerType.OPENAI_GPT35: {"input": 0.0000015, "output": 0.000002},
-            TokenizerType.ANTHROPIC_CLAUDE: {"input": 0.000008, "output": 0.000024},
-        }
-
-        if self.tokenizer_type not in pricing:
+        rates = _TOKEN_PRICING.get(self.tokenizer_type)
+        if rates is None:
             return 0.0
 
-        rates = pricing[self.tokenizer_type]
-        return self.input_tokens * rates["input"] + self.output_tokens * rates["output"]
+        return self.input_tokens * rates[0] + self.output_tokens * rates[1]
 
 
 class TokenCounter:
@@ -70,6 +92,10 @@ class TokenCounter:
         """
         self.tokenizer_type = tokenizer_type
         self._tokenizer_cache: Dict[str, Any] = {}
+        # text fingerprint -> tiktoken count, least recently used first. Hits read it
+        # without the lock, like CacheLayer; misses take it to insert and evict.
+        self._count_cache: "OrderedDict[int, int]" = OrderedDict()
+        self._count_cache_lock = threading.Lock()
 
     def count(self, text: str, is_output: bool = False) -> TokenUsage:
         """
@@ -84,7 +110,11 @@ class TokenCounter:
         """
         if self.tokenizer_type == TokenizerType.APPROXIMATE:
             tokens = self._approximate_count(text)
-        elif self.tokenizer_type in [TokenizerType.OPENAI_GPT4, TokenizerType.OPENAI_GPT35]:
+        elif self.tokenizer_type in [
+            TokenizerType.OPENAI_GPT4,
+            TokenizerType.OPENAI_GPT35,
+            TokenizerType.TIKTOKEN,
+        ]:
             tokens = self._openai_count(text)
         elif self.tokenizer_type == TokenizerType.ANTHROPIC_CLAUDE:
             tokens = self._anthropic_count(text)
@@ -108,6 +138,42 @@ class TokenCounter:
                 estimated=True,
             )
 
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many texts in one call.
+
+        With a tiktoken-backed tokenizer the whole list is encoded with
+        ``encode_batch``, crossing into the native tokenizer once instead of
+        once per text.
+
+        Args:
+            texts: Texts to count tokens for
+
+        Returns:
+            Token counts, in the same order as ``texts``
+        """
+        if self.tokenizer_type in [
+            TokenizerType.OPENAI_GPT4,
+            TokenizerType.OPENAI_GPT35,
+            TokenizerType.TIKTOKEN,
+        ]:
+            encoding = self._get_encoding()
+            if encoding is not None:
+                keys = [_fingerprint(text) for text in texts]
+                counts = [self._cached_count(key) for key in keys]
+                misses = [i for i, count in enumerate(counts) if count is None]
+                if misses:
+                    encoded = encoding.encode_batch(
+                        [texts[i] for i in misses], disallowed_special=()
+                    )
+                    for i, tokens in zip(misses, encoded):
+                        counts[i] = len(tokens)
+                    self._remember_counts([(keys[i], counts[i]) for i in misses])
+                return counts
+        elif self.tokenizer_type == TokenizerType.ANTHROPIC_CLAUDE:
+            return [self._anthropic_count(text) for text in texts]
+        return [self._approximate_count(text) for text in texts]
+
     def estimate(self, text: str, max_output_tokens: int = 1000) -> TokenUsage:
         """
         Estimate token usage for a request.
@@ -142,14 +208,13 @@ class TokenCounter:
         Returns:
             TokenUsage with total token counts
         """
-        total_input = 0
-
+        # Count every role and content in one batch
+        texts = []
         for message in messages:
-            # Count role and content
-            role_tokens = self.count(message.get("role", ""), is_output=False).input_tokens
-            content_tokens = self.count(message.get("content", ""), is_output=False).input_tokens
-            # Add overhead for message formatting (roughly 4 tokens per message)
-            total_input += role_tokens + content_tokens + 4
+            texts.append(message.get("role", ""))
+            texts.append(message.get("content", ""))
+        # Add overhead for message formatting (roughly 4 tokens per message)
+        total_input = sum(self.count_batch(texts)) + 4 * len(messages)
 
         return TokenUsage(
             input_tokens=total_input,
@@ -212,10 +277,11 @@ class TokenCounter:
 
         This is a fast approximation for when exact tokenization isn't needed.
         """
-        # Remove whitespace for more accurate count
-        cleaned = re.sub(r"\s+", " ", text.strip())
+        # Collapse whitespace runs for a more accurate count; split() and \s match the same
+        # characters, so this is the length re.sub(r"\s+", " ", text.strip()) would give
+        cleaned_length = len(" ".join(text.split()))
         # Rough approximation: 4 chars = 1 token
-        return max(1, len(cleaned) // 4)
+        return max(1, cleaned_length // 4)
 
     def _openai_count(self, text: str) -> int:
         """
@@ -223,20 +289,47 @@ class TokenCounter:
 
         Falls back to approximate if tiktoken not available.
         """
-        try:
-            import tiktoken
-
-            # Use cl100k_base for GPT-4 and GPT-3.5
-            encoding_name = "cl100k_base"
-
-            if encoding_name not in self._tokenizer_cache:
-                self._tokenizer_cache[encoding_name] = tiktoken.get_encoding(encoding_name)
-
-            encoding = self._tokenizer_cache[encoding_name]
-            return len(encoding.encode(text))
-        except ImportError:
+        encoding = self._get_encoding()
+        if encoding is None:
             # Fall back to approximate if tiktoken not installed
             return self._approximate_count(text)
+        key = _fingerprint(text)
+        count = self._cached_count(key)
+        if count is None:
+            count = len(encoding.encode(text, disallowed_special=()))
+            self._remember_counts([(key, count)])
+        return count
+
+    def _cached_count(self, key: int) -> Optional[int]:
+        count = self._count_cache.get(key)
+        if count is not None:
+            try:
+                self._count_cache.move_to_end(key)
+            except KeyError:
+                pass  # Evicted by a concurrent insert; the count read is still valid
+        return count
+
+    def _remember_counts(self, counts: List[Tuple[int, int]]) -> None:
+        with self._count_cache_lock:
+            cache = self._count_cache
+            for key, count in counts:
+                cache[key] = count
+            while len(cache) > _COUNT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _get_encoding(self) -> Optional[Any]:
+        """Return the cached tiktoken encoding, or None if tiktoken is not installed."""
+        # Use cl100k_base for GPT-4 and GPT-3.5
+        encoding_name = "cl100k_base"
+
+        if encoding_name not in self._tokenizer_cache:
+            try:
+                import tiktoken
+            except ImportError:
+                return None
+            self._tokenizer_cache[encoding_name] = tiktoken.get_encoding(encoding_name)
+
+        return self._tokenizer_cache[encoding_name]
 
     def _anthropic_count(self, text: str) -> int:
         """
@@ -264,15 +357,8 @@ def estimate_cost(tokens: int, tokenizer_type: TokenizerType, is_output: bool =
     Returns:
         Estimated cost in USD
     """
-    # Pricing as of 2024 (rough estimates)
-    pricing = {
-        TokenizerType.OPENAI_GPT4: {"input": 0.00003, "output": 0.00006},
-        TokenizerType.OPENAI_GPT35: {"input": 0.0000015, "output": 0.000002},
-        TokenizerType.ANTHROPIC_CLAUDE: {"input": 0.000008, "output": 0.000024},
-    }
-
-    if tokenizer_type not in pricing:
+    rates = _TOKEN_PRICING.get(tokenizer_type)
+    if rates is None:
         return 0.0
 
-    rate = pricing[tokenizer_type]["output" if is_output else "input"]
-    return tokens * rate
+    return tokens * (rates[1] if is_output else rates[0])
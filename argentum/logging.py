@@ -5,10 +5,13 @@ Provides consistent logging across all argentum modules with structured
 logging support and performance-conscious defaults.
 """
 
+import functools
 import logging
 import sys
+import threading
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Union
 
 
 class ArgentumFormatter(logging.Formatter):
@@ -28,45 +31,54 @@ class ArgentumFormatter(logging.Formatter):
             "RESET": "\033[0m",  # Reset
         }
 
-        super().__init__()
-
-    def format(self, record: logging.LogRecord) -> str:
-        """Format log record with argentum-specific formatting."""
-
-        # Build format string dynamically
+        # The layout only depends on constructor arguments, so build it once
         parts = []
 
-        if self.include_timestamp:
+        if include_timestamp:
             parts.append("%(asctime)s")
 
-        # Add color for log level
-        color = self.colors.get(record.levelname, "")
-        reset = self.colors["RESET"] if color else ""
-        parts.append(f"{color}%(levelname)-8s{reset}")
+        parts.append("%(argentum_level)s")
 
-        if self.include_module:
+        if include_module:
             parts.append("%(name)s")
 
         parts.append("%(message)s")
 
-        format_str = " | ".join(parts)
+        super().__init__(fmt=" | ".join(parts))
+
+        reset = self.colors["RESET"]
+        self._level_labels = {
+            level: f"{color}{level:<8}{reset}"
+            for level, color in self.colors.items()
+            if level != "RESET"
+        }
 
-        # Set the format string
-        self._style._fmt = format_str
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Format log record with argentum-specific formatting."""
+        level = record.levelname
+        record.argentum_level = self._level_labels.get(level) or f"{level:<8}"
 
         # Add custom fields to record
-        if hasattr(record, "agent_id"):
-            record.message = f"[Agent:{record.agent_id}] {record.getMessage()}"
-        elif hasattr(record, "session_id"):
-            record.message = f"[Session:{record.session_id}] {record.getMessage()}"
+        agent_id = getattr(record, "agent_id", None)
+        if agent_id is not None:
+            record.message = f"[Agent:{agent_id}] {record.message}"
         else:
-            record.message = record.getMessage()
+            session_id = getattr(record, "session_id", None)
+            if session_id is not None:
+                record.message = f"[Session:{session_id}] {record.message}"
 
         # Add context information if available
-        if hasattr(record, "context"):
-            record.message += f" (Context: {record.context})"
+        context = getattr(record, "context", None)
+        if context is not None:
+            record.message += f" (Context: {context})"
+
+        return super().formatMessage(record)
+
 
-        return super().format(record)
+# Configuration applied by the last setup_logging call and the handlers it installed
+_setup_lock = threading.RLock()
+_active_config: Optional[tuple] = None
+_installed_handlers: List[logging.Handler] = []
 
 
 def setup_logging(
@@ -75,16 +87,21 @@ def setup_logging(
     include_timestamp: bool = True,
     include_module: bool = True,
     log_file: Optional[str] = None,
+    force: bool = False,
 ) -> logging.Logger:
     """
     Set up logging configuration for argentum.
 
+    Repeated calls with the same arguments keep the handlers already installed
+    and only reapply the level, so this is cheap to call from many places.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: Format type ("standard", "structured", "minimal")
         include_timestamp: Include timestamp in logs
         include_module: Include module name in logs
         log_file: Optional file to write logs to
+        force: Rebuild the handlers even if this configuration is already active
 
     Returns:
         Configured logger instance
@@ -97,42 +114,59 @@ def setup_logging(
         >>> logger = setup_logging()
         >>> logger.info("State changed", extra={"agent_id": "agent_001", "context": "processing"})
     """
+    global _active_config, _installed_handlers
+
     # Get or create argentum logger
     logger = logging.getLogger("argentum")
 
-    # Clear any existing handlers
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-
-    # Set level
     if isinstance(level, str):
         level = getattr(logging, level.upper())
-    logger.setLevel(level)
-
-    # Create formatter based on type
-    if format_type == "minimal":
-        formatter = logging.Formatter("%(levelname)s: %(message)s")
-    elif format_type == "structured":
-        formatter = ArgentumFormatter(include_module=True, include_timestamp=True)
-    else:  # standard
-        formatter = ArgentumFormatter(
-            include_module=include_module, include_timestamp=include_timestamp
-        )
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # File handler if requested
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_formatter = logging.Formatter("%(asctime)s | %(levelname)-8s | %(name)s | %(message)s")
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
-    # Prevent propagation to root logger
-    logger.propagate = False
+    config = (format_type, include_timestamp, include_module, log_file)
+
+    with _setup_lock:
+        # Set level
+        logger.setLevel(level)
+
+        # Prevent propagation to root logger
+        logger.propagate = False
+
+        if not force and config == _active_config and logger.handlers == _installed_handlers:
+            return logger
+
+        # Create formatter based on type
+        if format_type == "minimal":
+            formatter = logging.Formatter("%(levelname)s: %(message)s")
+        elif format_type == "structured":
+            formatter = ArgentumFormatter(include_module=True, include_timestamp=True)
+        else:  # standard
+            formatter = ArgentumFormatter(
+                include_module=include_module, include_timestamp=include_timestamp
+            )
+
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers = [console_handler]
+
+        # File handler if requested
+        if log_file:
+            file_handler = logging.FileHandler(log_file)
+            file_formatter = logging.Formatter(
+                "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+            )
+            file_handler.setFormatter(file_formatter)
+            handlers.append(file_handler)
+
+        # Swap the whole list at once so concurrent log calls never see a half-built setup
+        previous = logger.handlers
+        logger.handlers = handlers
+        for handler in previous:
+            if handler in _installed_handlers:
+                handler.close()
+
+        _installed_handlers = handlers
+        _active_config = config
 
     return logger
 
@@ -159,28 +193,25 @@ class PerformanceLogger:
 
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or get_logger("performance")
-        self._timers: Dict[str, float] = {}
+        self._timers: Dict[str, int] = {}
 
     def start_timer(self, operation: str) -> None:
         """Start timing an operation."""
-        import time
-
-        self._timers[operation] = time.time()
+        self._timers[operation] = perf_counter_ns()
         self.logger.debug(f"Started timer for: {operation}")
 
     def end_timer(self, operation: str, extra_context: Optional[Dict[str, Any]] = None) -> float:
         """End timing an operation and log the result."""
-        import time
-
-        if operation not in self._timers:
+        started_ns = self._timers.pop(operation, None)
+        if started_ns is None:
             self.logger.warning(f"Timer '{operation}' was not started")
             return 0.0
 
-        elapsed = time.time() - self._timers[operation]
-        del self._timers[operation]
+        elapsed_ns = perf_counter_ns() - started_ns
+        elapsed = elapsed_ns / 1_000_000_000
 
         context = extra_context or {}
-        context.update({"operation": operation, "elapsed_ms": elapsed * 1000})
+        context.update({"operation": operation, "elapsed_ms": elapsed_ns / 1_000_000})
 
         self.logger.info(
             f"Operation '{operation}' completed in {elapsed:.3f}s", extra={"context": context}
@@ -284,7 +315,9 @@ def get_main_logger() -> logging.Logger:
     """Get the main argentum logger."""
     global _main_logger
     if _main_logger is None:
-        _main_logger = setup_logging()
+        with _setup_lock:
+            if _main_logger is None:
+                _main_logger = setup_logging()
     return _main_logger
 
 
@@ -329,33 +362,38 @@ def disable_logging() -> None:
 
 def log_function_call(func):
     """Decorator to log function calls with timing."""
-    import functools
-    import time
+    logger = get_logger(func.__module__ or "unknown")
+    name = func.__name__
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger = get_logger(func.__module__ or "unknown")
-        perf_logger = get_performance_logger()
+        # Fast path: skip timing and debug records when they would be filtered out
+        if not logger.isEnabledFor(logging.DEBUG):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("%s failed: %s", name, e)
+                raise
 
         # Start timing
-        start_time = time.time()
+        start_ns = perf_counter_ns()
 
         # Log function entry
-        logger.debug(f"Calling {func.__name__}")
+        logger.debug("Calling %s", name)
 
         try:
             result = func(*args, **kwargs)
 
             # Log successful completion
-            elapsed = time.time() - start_time
-            logger.debug(f"{func.__name__} completed successfully in {elapsed:.3f}s")
+            elapsed = (perf_counter_ns() - start_ns) / 1_000_000_000
+            logger.debug("%s completed successfully in %.3fs", name, elapsed)
 
             return result
 
         except Exception as e:
             # Log error
-            elapsed = time.time() - start_time
-            logger.error(f"{func.__name__} failed after {elapsed:.3f}s: {e}")
+            elapsed = (perf_counter_ns() - start_ns) / 1_000_000_000
+            logger.error("%s failed after %.3fs: %s", name, elapsed, e)
             raise
 
     return wrapper
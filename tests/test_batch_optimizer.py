@@ -0,0 +1,80 @@
+"""
+Tests for argentum.cost_optimization.batch_optimizer.
+
+These cover request timestamps, size-triggered batches and the lifetime of
+the background flusher thread.
+"""
+
+import gc
+import threading
+import time
+import weakref
+from datetime import datetime
+
+from argentum.cost_optimization.batch_optimizer import BatchOptimizer, BatchRequest
+
+
+class TestBatchRequest:
+    """Request creation times."""
+
+    def test_timestamp_is_stable(self):
+        """A request's timestamp does not move between reads."""
+        request = BatchRequest("r1", "prompt")
+        first = request.timestamp
+        time.sleep(0.01)
+
+        assert request.timestamp == first
+        assert abs((datetime.utcnow() - first).total_seconds()) < 5
+
+    def test_explicit_timestamp(self):
+        """An explicit timestamp is kept as given."""
+        when = datetime(2024, 1, 15, 10, 30)
+
+        assert BatchRequest("r1", "prompt", timestamp=when).timestamp == when
+
+
+class TestBatchOptimizer:
+    """Batch assembly and the background flusher."""
+
+    def test_full_batch_is_returned(self):
+        """The request that fills a batch gets it back, in arrival order."""
+        optimizer = BatchOptimizer(max_batch_size=3)
+
+        assert optimizer.add_request("r1", "a") is None
+        assert optimizer.add_request("r2", "b") is None
+        batch = optimizer.add_request("r3", "c")
+
+        assert [request.request_id for request in batch.requests] == ["r1", "r2", "r3"]
+
+    def test_flusher_sends_partial_batch(self):
+        """Pending requests go to on_batch_ready once the timeout passes."""
+        ready = threading.Event()
+        batches = []
+
+        def on_batch_ready(batch):
+            batches.append(batch)
+            ready.set()
+
+        optimizer = BatchOptimizer(
+            max_batch_size=10, timeout_seconds=0.05, on_batch_ready=on_batch_ready
+        )
+        try:
+            optimizer.add_request("r1", "a")
+            assert ready.wait(2)
+        finally:
+            optimizer.shutdown()
+
+        assert [len(batch.requests) for batch in batches] == [1]
+
+    def test_unreferenced_optimizer_is_collected(self):
+        """The flusher thread does not keep a dropped optimizer alive, and then exits."""
+        optimizer = BatchOptimizer(timeout_seconds=0.01, on_batch_ready=lambda batch: None)
+        flusher = optimizer._flusher
+        ref = weakref.ref(optimizer)
+
+        del optimizer
+        gc.collect()
+        flusher.join(2)
+
+        assert ref() is None
+        assert not flusher.is_alive()
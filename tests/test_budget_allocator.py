@@ -0,0 +1,110 @@
+"""
+Tests for argentum.cost_optimization.budget_allocator.
+
+These cover how each allocation strategy divides the available budget between
+registered agents, including degenerate priorities, conservation of the budget
+across rounds and the aging used by the DYNAMIC strategy.
+"""
+
+import pytest
+
+from argentum.cost_optimization.budget_allocator import (
+    _AGING_STEP,
+    _MAX_AGE,
+    _VECTORIZE_MIN_AGENTS,
+    AllocationStrategy,
+    BudgetAllocator,
+)
+
+
+def allocated(plan):
+    """Map agent id to allocated tokens for an AllocationPlan."""
+    return {agent_id: a.allocated_budget for agent_id, a in plan.allocations.items()}
+
+
+class TestPriorityBasedAllocation:
+    """Allocation in proportion to agent priority."""
+
+    def test_shares_follow_priority(self):
+        """Each agent gets its priority's fraction of the available budget."""
+        allocator = BudgetAllocator(1000, AllocationStrategy.PRIORITY_BASED, reserve_percentage=0)
+        allocator.register_agent("a", priority=1)
+        allocator.register_agent("b", priority=3)
+
+        assert allocated(allocator.allocate()) == {"a": 250, "b": 750}
+
+    @pytest.mark.parametrize("agent_count", [3, _VECTORIZE_MIN_AGENTS])
+    def test_zero_priorities_fall_back_to_equal(self, agent_count):
+        """A zero priority total splits the budget equally instead of dividing by zero."""
+        allocator = BudgetAllocator(
+            agent_count * 10, AllocationStrategy.PRIORITY_BASED, reserve_percentage=0
+        )
+        for i in range(agent_count):
+            allocator.register_agent(f"agent-{i}", priority=0)
+
+        assert set(allocated(allocator.allocate()).values()) == {10}
+
+
+class TestFairShareAllocation:
+    """Weighted deficit round robin (FAIR_SHARE)."""
+
+    @pytest.mark.parametrize(
+        "strategy", [AllocationStrategy.FAIR_SHARE, AllocationStrategy.DYNAMIC]
+    )
+    def test_every_round_hands_out_the_whole_budget(self, strategy):
+        """Rounding never loses or invents tokens."""
+        allocator = BudgetAllocator(1000, strategy, reserve_percentage=0.1)
+        for agent_id, priority in (("a", 1), ("b", 2), ("c", 4)):
+            allocator.register_agent(agent_id, priority=priority)
+
+        for _ in range(20):
+            assert sum(allocated(allocator.allocate()).values()) == 900
+
+    def test_long_run_shares_are_exact(self):
+        """Over enough rounds each agent receives exactly its weighted share."""
+        allocator = BudgetAllocator(100, AllocationStrategy.FAIR_SHARE, reserve_percentage=0)
+        for agent_id, priority in (("a", 1), ("b", 1), ("c", 1)):
+            allocator.register_agent(agent_id, priority=priority)
+
+        totals = dict.fromkeys("abc", 0)
+        for _ in range(30):
+            for agent_id, tokens in allocated(allocator.allocate()).items():
+                totals[agent_id] += tokens
+            # Never more than one token away from the exact share at any point
+            assert max(totals.values()) - min(totals.values()) <= 1
+
+        assert totals == {"a": 1000, "b": 1000, "c": 1000}
+
+
+class TestDynamicAllocation:
+    """Priority plus aging for agents that exhaust their allocation (DYNAMIC)."""
+
+    def test_exhausting_agent_ages(self):
+        """An agent that uses its whole allocation gets more next round, up to the cap."""
+        allocator = BudgetAllocator(1200, AllocationStrategy.DYNAMIC, reserve_percentage=0)
+        allocator.register_agent("busy", priority=1)
+        allocator.register_agent("idle", priority=1)
+
+        shares = []
+        for _ in range(_MAX_AGE + 2):
+            plan = allocated(allocator.allocate())
+            shares.append(plan["busy"])
+            allocator.record_usage("busy", plan["busy"])
+
+        assert shares[0] == 600
+        assert shares == sorted(shares)
+        # Capped at priority + _MAX_AGE * _AGING_STEP against the idle agent's 1
+        capped_weight = 1 + _MAX_AGE * _AGING_STEP
+        assert shares[-1] == shares[-2] == int(1200 * capped_weight / (capped_weight + 1))
+
+    def test_age_resets_once_demand_is_met(self):
+        """An agent that stops exhausting its allocation falls back to its priority share."""
+        allocator = BudgetAllocator(1200, AllocationStrategy.DYNAMIC, reserve_percentage=0)
+        allocator.register_agent("busy", priority=1)
+        allocator.register_agent("idle", priority=1)
+
+        plan = allocated(allocator.allocate())
+        allocator.record_usage("busy", plan["busy"])
+        assert allocated(allocator.allocate())["busy"] > 600
+
+        assert allocated(allocator.allocate()) == {"busy": 600, "idle": 600}
@@ -0,0 +1,167 @@
+"""
+Tests for argentum.cost_optimization.cache.
+
+These cover exact lookups across the lock-striped shards, LRU eviction under
+concurrent access, and the semantic fallback for near-miss keys.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from argentum.cost_optimization.cache import CacheConfig, CacheHit, CacheLayer, CacheMiss
+
+
+def letter_embedder(text):
+    """Bag-of-letters embedding: keys with the same letters are identical vectors."""
+    vector = [0.0] * 26
+    for char in text.lower():
+        if "a" <= char <= "z":
+            vector[ord(char) - ord("a")] += 1.0
+    return vector
+
+
+class TestCacheLayer:
+    """Exact-match behaviour of CacheLayer."""
+
+    def test_hit_after_set_with_normalized_key(self):
+        """Keys differing only in whitespace share one entry."""
+        cache = CacheLayer()
+        cache.set("what is  the\tanswer ", 42)
+
+        result = cache.get(" what is the answer")
+
+        assert isinstance(result, CacheHit)
+        assert result.value == 42
+        assert result.key == "what is the answer"
+
+    def test_miss_and_expiry(self):
+        """Unknown and expired keys are misses, and expired entries are dropped."""
+        cache = CacheLayer()
+        assert isinstance(cache.get("missing"), CacheMiss)
+
+        cache.set("short-lived", 1, ttl_seconds=0.01)
+        time.sleep(0.02)
+
+        assert isinstance(cache.get("short-lived"), CacheMiss)
+        assert cache.get_stats().size == 0
+
+    def test_fingerprint_collision_is_a_miss(self, monkeypatch):
+        """Keys that share a fingerprint never get each other's value."""
+        monkeypatch.setattr(CacheLayer, "_fingerprint", staticmethod(lambda cache_key: 7))
+        cache = CacheLayer()
+        cache.set("first prompt", "first answer")
+
+        assert isinstance(cache.get("second prompt"), CacheMiss)
+        assert cache.get("first prompt").value == "first answer"
+
+        cache.set("second prompt", "second answer")
+        assert cache.get("second prompt").value == "second answer"
+        assert isinstance(cache.get("first prompt"), CacheMiss)
+
+    def test_size_bounded_by_eviction(self):
+        """The cache never holds more than its shards' combined capacity."""
+        cache = CacheLayer(CacheConfig(max_size=64))
+        for i in range(1000):
+            cache.set(f"key {i}", i)
+
+        stats = cache.get_stats()
+        assert stats.size <= 64
+        assert stats.evictions == 1000 - stats.size
+
+    def test_concurrent_set_and_get(self):
+        """
+        Lock-free hits racing evicting sets must not raise.
+
+        A tiny switch interval forces thread switches inside the OrderedDict
+        operations, which is where an iteration-based eviction used to fail.
+        """
+        cache = CacheLayer(CacheConfig(max_size=100))
+        errors = []
+
+        def worker(seed):
+            try:
+                for i in range(5000):
+                    key = f"k{(i * 7 + seed) % 300}"
+                    if not isinstance(cache.get(key), CacheHit):
+                        cache.set(key, i)
+            except Exception as exc:  # pragma: no cover - only on failure
+                errors.append(exc)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        stats = cache.get_stats()
+        assert stats.total_requests == 8 * 5000
+        assert stats.size <= 112  # 16 shards of ceil(100 / 16) entries
+
+
+class TestSemanticCache:
+    """Nearest-neighbour fallback after an exact miss."""
+
+    def test_similar_key_hits(self):
+        """A key whose embedding is close enough returns the cached value."""
+        cache = CacheLayer(CacheConfig(semantic_threshold=0.95), embedder=letter_embedder)
+        cache.set("what is the capital of france", "paris")
+
+        result = cache.get("whats the capital of france")
+
+        assert isinstance(result, CacheHit)
+        assert result.value == "paris"
+        assert result.key == "whats the capital of france"
+        assert cache.get_stats().hits == 1
+
+    def test_dissimilar_key_misses(self):
+        """Below the threshold the lookup is a miss."""
+        cache = CacheLayer(CacheConfig(semantic_threshold=0.95), embedder=letter_embedder)
+        cache.set("what is the capital of france", "paris")
+
+        assert isinstance(cache.get("zzz qqq"), CacheMiss)
+        assert cache.get_stats().misses == 1
+
+    def test_evicted_entries_leave_the_index(self):
+        """Evicted and expired entries are never served semantically."""
+        cache = CacheLayer(
+            CacheConfig(max_size=16, semantic_threshold=0.99), embedder=letter_embedder
+        )
+        cache.set("abc", "first", ttl_seconds=0.01)
+        time.sleep(0.02)
+        assert isinstance(cache.get("abc"), CacheMiss)
+        assert isinstance(cache.get("cba"), CacheMiss)
+
+        for i in range(200):
+            cache.set(f"key {i}", i)
+        assert len(cache._semantic._labels) == cache.get_stats().size
+
+    def test_disabled_without_embedder_or_flag(self):
+        """Semantic lookups need both an embedder and enable_semantic_cache."""
+        assert CacheLayer()._semantic is None
+        disabled = CacheLayer(CacheConfig(enable_semantic_cache=False), embedder=letter_embedder)
+        assert disabled._semantic is None
+
+    @pytest.mark.parametrize("threshold", [0.5, 0.9])
+    def test_exact_hit_skips_embedder(self, threshold):
+        """Exact hits never call the embedder."""
+        calls = []
+
+        def embedder(text):
+            calls.append(text)
+            return letter_embedder(text)
+
+        cache = CacheLayer(CacheConfig(semantic_threshold=threshold), embedder=embedder)
+        cache.set("hello world", 1)
+        calls.clear()
+
+        assert isinstance(cache.get("hello world"), CacheHit)
+        assert calls == []
@@ -132,6 +132,134 @@ class TestContextDecay:
             weights = [item[2] for item in medium_threshold_items]
             assert weights == sorted(weights, reverse=True)
 
+    def test_top_k_active_items(self):
+        """
+        Test bounding get_active to the most relevant items.
+
+        Validates that agents with a fixed context budget get exactly the
+        heaviest items, in the same order as the unbounded ranking.
+        """
+        decay = ContextDecay(half_life_steps=5)
+
+        for i in range(10):
+            decay.add(f"item_{i}", f"data_{i}", importance=(i + 1) / 10)
+        decay.step()
+
+        full_ranking = decay.get_active(threshold=0.0)
+        top_three = decay.get_active(threshold=0.0, top_k=3)
+
+        assert top_three == full_ranking[:3]
+        assert [item[0] for item in top_three] == ["item_9", "item_8", "item_7"]
+
+        # Bounds larger than the active set return everything
+        assert decay.get_active(threshold=0.0, top_k=50) == full_ranking
+        assert decay.get_active(threshold=0.0, top_k=0) == []
+
+        with pytest.raises(ValueError, match="top_k must be non-negative"):
+            decay.get_active(top_k=-1)
+
+    def test_add_many_matches_individual_adds(self):
+        """
+        Test bulk ingestion of context items.
+
+        Validates that a batch behaves like adding each item in turn, including
+        updates to existing keys and repeated keys within the batch.
+        """
+        batched = ContextDecay(half_life_steps=5)
+        single = ContextDecay(half_life_steps=5)
+        batched.add("tool_a", "stale", importance=0.2)
+        single.add("tool_a", "stale", importance=0.2)
+        batched.step()
+        single.step()
+
+        keys = ["tool_a", "tool_b", "tool_c", "tool_b"]
+        values = ["fresh", "first", "third", "second"]
+        importances = [0.9, 0.5, 0.7, 0.6]
+        batched.add_many(keys, values, importances)
+        for key, value, importance in zip(keys, values, importances):
+            single.add(key, value, importance=importance)
+
+        assert batched.get_all_items() == single.get_all_items()
+        values_by_key = {item[0]: item[1] for item in batched.get_all_items()}
+        assert values_by_key == {"tool_a": "fresh", "tool_b": "second", "tool_c": "third"}
+
+        # Invalid input is rejected before anything is added
+        with pytest.raises(ValueError, match="Importance must be between"):
+            batched.add_many(["tool_d", "tool_e"], ["x", "y"], [0.5, 1.5])
+        with pytest.raises(ValueError, match="same length"):
+            batched.add_many(["tool_d"], ["x", "y"])
+        assert batched.get_stats()["total_items"] == 3
+
+    def test_cost_pruning_report(self):
+        """
+        Test that budget pruning drops the least cost-effective item.
+
+        Validates that the cost report credits the storage cost actually freed,
+        so agents can see what pruning saved them.
+        """
+        decay = ContextDecay(half_life_steps=5, cost_optimization=True, max_context_cost=1.0)
+        decay.add("verbose_log", "...", importance=0.2, storage_cost=0.45)
+        decay.add("user_goal", "ship it", importance=0.9, storage_cost=0.45)
+
+        # Going over budget prunes the low-value log to make room
+        decay.add("latest_reply", "done", importance=1.0, storage_cost=0.45)
+
+        remaining = {item[0] for item in decay.get_all_items()}
+        assert remaining == {"user_goal", "latest_reply"}
+
+        report = decay.get_cost_report()
+        assert report["items_pruned"] == 1
+        assert math.isclose(report["cost_saved"], 0.45)
+        assert math.isclose(report["total_cost"], 0.9)
+        assert report["cost_history"][-1]["cost_freed"] == report["cost_saved"]
+
+    @pytest.mark.parametrize("half_life", [3, 8, 10])
+    def test_vectorized_weights_match_item_by_item(self, half_life, monkeypatch):
+        """
+        Test that store size never changes an item's weight.
+
+        Validates that the NumPy refresh used for large stores rounds every
+        weight exactly like the per-item formula, so threshold filtering gives
+        the same answer whichever path computed it.
+        """
+        pytest.importorskip("numpy")
+        import argentum.context_decay as context_decay
+
+        monkeypatch.setattr(context_decay, "_numba_module", False)  # plain NumPy path
+        decay = ContextDecay(half_life_steps=half_life)
+        for i in range(500):
+            decay.add(f"item_{i}", i, importance=(i % 97 + 1) / 97, timestamp=-(i * 37 % 211))
+        decay.step()
+
+        decay._refresh_weights_fast(True)
+        vectorized = list(decay._weight)
+        decay._refresh_weights_fast(False)
+
+        assert vectorized == list(decay._weight)
+
+    def test_storage_costs_recorded_per_tracker(self):
+        """
+        Test that storage costs go to the instance's own or the injected tracker.
+
+        Validates that short-lived decay stores do not accumulate cost events in
+        shared state, while callers can still pool costs in a tracker they own.
+        """
+        pytest.importorskip("argentum.cost_optimization.cost_tracker")
+        from argentum.cost_optimization.cost_tracker import CostTracker
+
+        first = ContextDecay(half_life_steps=5, cost_optimization=True)
+        second = ContextDecay(half_life_steps=5, cost_optimization=True)
+        first.add("item", "data", storage_cost=0.1)
+        assert first._cost_tracker is not second._cost_tracker
+        assert len(first._cost_tracker._events) == 1
+        assert len(second._cost_tracker._events) == 0
+
+        shared = CostTracker()
+        for key in ("a", "b"):
+            decay = ContextDecay(half_life_steps=5, cost_optimization=True, cost_tracker=shared)
+            decay.add(key, "data", storage_cost=0.1)
+        assert len(shared._events) == 2
+
     def test_context_item_updates(self):
         """
         Test updating existing context items resets their decay.
@@ -0,0 +1,74 @@
+"""
+Tests for argentum.cost_optimization.cost_tracker.
+
+These cover explicit costs, period queries over the timestamp column and
+clearing old events, including when the wall clock is stepped backwards.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from argentum.cost_optimization import cost_tracker as cost_tracker_module
+from argentum.cost_optimization.cost_tracker import CostTracker
+
+T0 = datetime(2024, 1, 15, 12, 0, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replace utcnow in the tracker module with a list of readings, used in order.
+
+    Once the list is empty utcnow returns T0, so building a CostTracker, which
+    reads the clock for its start time, does not use up a queued reading.
+    """
+    readings = []
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return readings.pop(0) if readings else T0
+
+    monkeypatch.setattr(cost_tracker_module, "datetime", FakeDatetime)
+    return readings
+
+
+class TestCostTracker:
+    """Recording events and querying them by period."""
+
+    def test_explicit_cost_is_recorded(self):
+        """A cost passed to record_usage is used instead of the estimate."""
+        tracker = CostTracker()
+        tracker.record_usage("completion", 1000, agent_id="a", cost=0.25)
+
+        assert tracker.get_total_cost() == pytest.approx(0.25)
+        assert tracker.get_cost_by_agent() == {"a": pytest.approx(0.25)}
+
+    def test_period_queries(self, clock):
+        """Only events inside the period are counted, and clear drops older ones."""
+        tracker = CostTracker()
+        clock.extend(T0 + timedelta(minutes=minute) for minute in range(5))
+        for _ in range(5):
+            tracker.record_usage("completion", 100, cost=1.0)
+
+        start, end = T0 + timedelta(minutes=1), T0 + timedelta(minutes=3)
+        assert tracker.get_cost_for_period(start, end) == pytest.approx(3.0)
+        assert tracker.clear(before_time=start) == 1
+        assert tracker.get_total_cost() == pytest.approx(4.0)
+
+    def test_clock_stepped_back(self, clock):
+        """An event recorded after the clock went back still lands in time order."""
+        tracker = CostTracker()
+        clock.extend(
+            [T0, T0 + timedelta(minutes=10), T0 + timedelta(minutes=5), T0 + timedelta(minutes=11)]
+        )
+        events = [tracker.record_usage("completion", 100, cost=1.0) for _ in range(4)]
+
+        timestamps = [event.timestamp for event in events]
+        assert timestamps == sorted(timestamps)
+        assert timestamps[2] == T0 + timedelta(minutes=10)
+
+        assert tracker.get_cost_for_period(T0, T0 + timedelta(minutes=11)) == pytest.approx(4.0)
+        assert tracker.clear(before_time=T0 + timedelta(minutes=10)) == 1
+        assert tracker.get_total_cost() == pytest.approx(3.0)
@@ -0,0 +1,100 @@
+"""
+Tests for argentum.cost_optimization.token_budget.
+
+These cover budget enforcement and threshold alerts, both when every consume()
+updates the shared counters and when usage is coalesced per thread.
+"""
+
+import threading
+
+import pytest
+
+from argentum.cost_optimization.token_budget import (
+    BudgetExceededError,
+    BudgetStatus,
+    TokenBudgetManager,
+)
+
+
+def alert_statuses(manager):
+    """Statuses of the alerts a manager has raised, in order."""
+    return [alert.status for alert in manager.get_status().alerts]
+
+
+class TestTokenBudgetManager:
+    """Per-call accounting (flush_interval=1)."""
+
+    def test_consume_raises_alerts_and_enforces_budget(self):
+        """Crossing each threshold raises one alert, and overspending raises."""
+        fired = []
+        manager = TokenBudgetManager(10, on_alert=fired.append)
+        for _ in range(10):
+            manager.consume(1)
+
+        assert alert_statuses(manager) == [BudgetStatus.WARNING, BudgetStatus.EXCEEDED]
+        assert len(fired) == 2
+        with pytest.raises(BudgetExceededError):
+            manager.consume(1)
+
+    def test_per_agent_budget(self):
+        """An agent cannot spend past per_agent_budget while others still can."""
+        manager = TokenBudgetManager(100, per_agent_budget=5)
+        manager.consume(5, agent_id="a")
+
+        assert not manager.can_afford(1, agent_id="a")
+        assert manager.can_afford(5, agent_id="b")
+        with pytest.raises(BudgetExceededError):
+            manager.consume(1, agent_id="a")
+
+
+class TestCoalescedUsage:
+    """Per-thread coalescing (flush_interval > 1)."""
+
+    def test_queries_flush_and_raise_alerts(self):
+        """Usage still pending when status is read raises the alerts it crosses."""
+        fired = []
+        manager = TokenBudgetManager(10, on_alert=fired.append, flush_interval=4)
+        for _ in range(10):
+            manager.consume(1)
+
+        status = manager.get_status()
+
+        assert status.status == BudgetStatus.EXCEEDED
+        assert alert_statuses(manager) == [BudgetStatus.WARNING, BudgetStatus.EXCEEDED]
+        assert [alert.status for alert in fired] == alert_statuses(manager)
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            lambda manager: manager.get_agent_usage("a"),
+            lambda manager: manager.refund(0, agent_id="a"),
+            lambda manager: manager.flush(),
+        ],
+    )
+    def test_every_flush_checks_alerts(self, query):
+        """Each query that flushes pending usage also checks the thresholds."""
+        fired = []
+        manager = TokenBudgetManager(10, on_alert=fired.append, flush_interval=100)
+        manager.consume(9, agent_id="a")
+        assert fired == []
+
+        query(manager)
+
+        assert [alert.status for alert in fired] == [BudgetStatus.WARNING]
+
+    def test_usage_from_all_threads_is_counted(self):
+        """Flushing collects the pending usage of every thread, finished or not."""
+        manager = TokenBudgetManager(10_000, flush_interval=7)
+
+        def worker():
+            for _ in range(100):
+                manager.consume(1, agent_id="a")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert manager.get_agent_usage("a") == 400
+        assert manager.get_status().current_usage == 400